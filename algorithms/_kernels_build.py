@@ -0,0 +1,15 @@
+"""
+Ahead-of-time build of the Priority Engine kernels
+Run `python -m algorithms._kernels_build` (needs numba) to write algorail_kernels next to
+this file; _priority_kernels then uses it without paying any JIT compile on first call
+"""
+import os
+from numba.pycc import CC
+from algorithms._priority_kernels import _score_all_loop
+
+cc = CC('algorail_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+cc.export('score_all', 'f8[:](f8[:], f8[:], f8[:])')(_score_all_loop)
+
+if __name__ == "__main__":
+    cc.compile()
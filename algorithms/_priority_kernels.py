@@ -0,0 +1,41 @@
+"""
+Numeric kernels for the Priority Engine
+Precompiled or JIT-compiled with numba when available, plain NumPy otherwise
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
+# Delay penalty: 0.01 per minute late, capped so delay never outweighs a full priority level
+DELAY_PENALTY_PER_MINUTE = 0.01
+MAX_DELAY_PENALTY = 0.5
+
+
+def _score_all_loop(base_priority, time_factor, delay):
+    """Priority score per train: base priority scaled by the time factor, plus the delay penalty"""
+    out = np.empty(base_priority.shape[0])
+    # Rows are independent and each iteration only writes out[i], so the loop runs across cores
+    for i in prange(base_priority.shape[0]):
+        penalty = delay[i] * DELAY_PENALTY_PER_MINUTE
+        # Written as a comparison rather than min() so a NaN delay stays NaN, as with np.minimum
+        if penalty > MAX_DELAY_PENALTY:
+            penalty = MAX_DELAY_PENALTY
+        out[i] = base_priority[i] * time_factor[i] + penalty
+    return out
+
+
+def _score_all_numpy(base_priority, time_factor, delay):
+    return base_priority * time_factor + np.minimum(delay * DELAY_PENALTY_PER_MINUTE, MAX_DELAY_PENALTY)
+
+
+# Prefer the ahead-of-time build from _kernels_build (no compile on the first call), then the
+# JIT. No fastmath: missing delays arrive as NaN and must propagate into the score. The thread
+# count follows numba's NUMBA_NUM_THREADS environment variable
+try:
+    from algorithms.algorail_kernels import score_all
+except ImportError:
+    score_all = njit(parallel=True, cache=True)(_score_all_loop) if njit is not None else _score_all_numpy
@@ -4,10 +4,15 @@ Integrates ACO, GA, and Heuristic optimizers with 3-stage pipeline approach.
 Self-contained module with all optimization algorithms.
 """
 
-import random
+import os
 import pandas as pd
 import numpy as np
+import operator
 import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import reduce
+from itertools import repeat
 from typing import List, Dict, Tuple
 
 class OptimizationResult:
@@ -23,11 +28,26 @@ class OptimizationResult:
         self.success = False
         self.fitness_history = []
 
+def _section_records_by_train(train_sections_df: pd.DataFrame, entry_cols, exit_cols) -> Dict[str, List[Dict]]:
+    """Each train's sections as section_id/entry_time/exit_time records, built in one groupby pass.
+    Times come from the first of entry_cols/exit_cols present in the frame, else 0."""
+    def first_column(candidates):
+        return next((train_sections_df[col] for col in candidates if col in train_sections_df), 0)
+    
+    records = pd.DataFrame({
+        'train_id': train_sections_df['train_id'],
+        'section_id': train_sections_df['section_id'],
+        'entry_time': first_column(entry_cols),
+        'exit_time': first_column(exit_cols)
+    })
+    return {train_id: rows.drop(columns='train_id').to_dict('records')
+            for train_id, rows in records.groupby('train_id', sort=False)}
+
 class SimpleHeuristicOptimizer:
     """Simple heuristic optimizer based on priority rules"""
     
-    def __init__(self):
-        pass
+    def __init__(self, seed=None):
+        self.rng = np.random.default_rng(seed)
     
     def optimize(self, trains_df: pd.DataFrame, sections_df: pd.DataFrame,
                 train_sections_df: pd.DataFrame) -> OptimizationResult:
@@ -40,40 +60,29 @@ class SimpleHeuristicOptimizer:
             # Sort trains by priority (lower number = higher priority)
             trains_sorted = trains_df.sort_values('priority').copy()
             
-            schedule = {}
-            total_delay = 0
-            conflicts_resolved = 0
+            sections_by_train = _section_records_by_train(
+                train_sections_df, ('scheduled_entry_time', 'start_time'), ('scheduled_exit_time', 'end_time')
+            )
             
-            for _, train in trains_sorted.iterrows():
-                train_id = train['train_id']
-                base_delay = train.get('delay_minutes', 0)
-                priority = train.get('priority', 5)
-                
-                # Assign delay based on priority
-                if priority <= 2:  # High priority
-                    additional_delay = random.uniform(0, 5)
-                elif priority <= 4:  # Medium priority
-                    additional_delay = random.uniform(2, 10)
-                else:  # Low priority
-                    additional_delay = random.uniform(5, 20)
-                
-                final_delay = base_delay + additional_delay
-                total_delay += final_delay
-                
-                # Create train schedule
-                train_schedule = []
-                train_sections = train_sections_df[train_sections_df['train_id'] == train_id]
-                
-                for _, section in train_sections.iterrows():
-                    train_schedule.append({
-                        'section_id': section['section_id'],
-                        'entry_time': section.get('scheduled_entry_time', section.get('start_time', 0)),
-                        'exit_time': section.get('scheduled_exit_time', section.get('end_time', 0)),
-                        'delay_added': additional_delay
-                    })
-                
-                schedule[train_id] = train_schedule
-                conflicts_resolved += 1
+            # Assign delay based on priority: high (<= 2), medium (<= 4), low - drawn for all trains at once
+            n = len(trains_sorted)
+            pri = trains_sorted['priority'].to_numpy()
+            additional_delays = np.select(
+                [pri <= 2, pri <= 4],
+                [self.rng.uniform(0, 5, n), self.rng.uniform(2, 10, n)],
+                default=self.rng.uniform(5, 20, n)
+            )
+            
+            base_delays = trains_sorted['delay_minutes'].to_numpy() if 'delay_minutes' in trains_sorted else 0
+            total_delay = float(np.sum(base_delays + additional_delays))
+            
+            # Create train schedules
+            schedule = {
+                train_id: [{**section, 'delay_added': additional_delay}
+                           for section in sections_by_train.get(train_id, [])]
+                for train_id, additional_delay in zip(trains_sorted['train_id'], additional_delays.tolist())
+            }
+            conflicts_resolved = len(trains_sorted)
             
             result.schedule = schedule
             result.total_delay = total_delay
@@ -88,147 +97,277 @@ class SimpleHeuristicOptimizer:
         result.computation_time = time.time() - start_time
         return result
 
+def _construct_ant(weights, rng):
+    """Build an ant's train order (as positions) by roulette over the unvisited trains' weights"""
+    n = len(weights)
+    # Unvisited positions live in unvisited[:remaining]; picks are swap-popped to the tail
+    unvisited = np.arange(n)
+    order = np.empty(n, dtype=np.intp)
+    idx = rng.integers(n)
+
+    for step in range(n):
+        remaining = n - step - 1
+        current = unvisited[idx]
+        unvisited[idx] = unvisited[remaining]
+        order[step] = current
+        if not remaining:
+            break
+
+        # Inverse CDF over the cumulative weights of every unvisited train in one pass
+        cumulative = np.cumsum(weights[current, unvisited[:remaining]])
+        idx = min(int(np.searchsorted(cumulative, rng.random() * cumulative[-1], side='right')), remaining - 1)
+
+    return order
+
+def _score_ant(order, priority_by_pos, conflicts):
+    score = 0
+    priority_penalty = 100
+    conflict_penalty = 1000
+
+    # Priority inversion penalty: one per pair where an earlier train has a larger priority number
+    pri = priority_by_pos[order]
+    inversions = np.count_nonzero(np.triu(pri[:, None] > pri[None, :], k=1))
+    score += priority_penalty * inversions
+
+    # Section conflict penalty: consecutive trains sharing any section
+    score += conflict_penalty * np.count_nonzero(conflicts[order[:-1], order[1:]])
+
+    return score
+
+def _run_ant_batch(weights, tables, n_ants, seed):
+    """Construct and score a batch of ants in a worker process"""
+    priority_by_pos, conflicts = tables
+    rng = np.random.default_rng(seed)
+    orders = [_construct_ant(weights, rng) for _ in range(n_ants)]
+    return orders, [_score_ant(order, priority_by_pos, conflicts) for order in orders]
+
 class ACOOptimizer:
     """Original ACOOptimizer for train scheduling"""
 
-    def __init__(self, population_size=30, iterations=50, alpha=1.0, beta=5.0, evaporation_rate=0.5):
+    def __init__(self, population_size=30, iterations=50, alpha=1.0, beta=5.0, evaporation_rate=0.5,
+                 parallel=False, max_workers=None, seed=None):
         self.population_size = population_size
         self.iterations = iterations
         self.alpha = alpha
         self.beta = beta
         self.evaporation_rate = evaporation_rate
+        self.parallel = parallel
+        self.max_workers = max_workers or os.cpu_count() or 1
         self.best_schedule = None
         self.best_score = float('inf')
         self.trains_df = None
         self.train_sections_df = None
+        # Per-run lookup tables, all indexed by a train's position in trains_df
+        self.priority_by_pos = None
+        self.conflicts = None
+        self.eta = None
+        self.rng = np.random.default_rng(seed)
 
     def _initialize_pheromones(self, trains):
-        pheromones = {}
-        for t1 in trains:
-            for t2 in trains:
-                if t1 != t2:
-                    pheromones[(t1, t2)] = 1.0
-        return pheromones
+        # Dense (from, to) matrix indexed by position in `trains`; the diagonal is never read.
+        # float32 is plenty for pheromone levels and halves the memory traffic of each update
+        return np.ones((len(trains), len(trains)), dtype=np.float32)
+
+    def _initialize_heuristic(self, pri):
+        return (1.0 / (np.abs(pri[:, None] - pri[None, :]) + 1)).astype(np.float32)
 
-    def _calculate_heuristic(self, t1_priority, t2_priority):
-        return 1.0 / (abs(t1_priority - t2_priority) + 1)
+    def _initialize_conflicts(self, trains, train_sections_df):
+        """Boolean matrix marking train pairs that share at least one section"""
+        # Each train's sections as an int bitmask so a pair check is a single `&`
+        section_bit = {sid: 1 << i for i, sid in enumerate(pd.unique(train_sections_df['section_id']))}
+        section_mask_by_train = {
+            train_id: reduce(operator.or_, (section_bit[sid] for sid in section_ids), 0)
+            for train_id, section_ids in train_sections_df.groupby('train_id', sort=False)['section_id']
+        }
+        masks = [section_mask_by_train.get(t, 0) for t in trains]
+        return np.array([[bool(mi & mj) for mj in masks] for mi in masks], dtype=bool).reshape(len(trains), len(trains))
 
     def optimize(self, trains_df: pd.DataFrame, sections_df: pd.DataFrame,
-                 train_sections_df: pd.DataFrame, seed_solution=None) -> Tuple[List, float]:
+                 train_sections_df: pd.DataFrame, seed_solution=None, pool=None) -> Tuple[List, float]:
         self.trains_df = trains_df
         self.train_sections_df = train_sections_df
         trains = trains_df['train_id'].tolist()
-        priorities = {tid: trains_df[trains_df['train_id'] == tid]['priority'].values[0] for tid in trains}
+        # Positions follow trains_df row order, so priorities are read straight off the column
+        self.priority_by_pos = trains_df['priority'].to_numpy(dtype=float)
+        self.conflicts = self._initialize_conflicts(trains, train_sections_df)
         pheromones = self._initialize_pheromones(trains)
+        self.eta = self._initialize_heuristic(self.priority_by_pos)
+        best_order = None
 
-        for iteration in range(self.iterations):
-            population = []
-            scores = []
+        # Borrow the caller's pool if given, otherwise own one only when running in parallel
+        if pool is not None:
+            executor = nullcontext(pool)
+        elif self.parallel:
+            executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        else:
+            executor = nullcontext()
 
-            for _ in range(self.population_size):
-                schedule = self._construct_solution(trains, pheromones, priorities)
-                score = self._evaluate(schedule)
-                population.append(schedule)
-                scores.append(score)
+        with executor as pool:
+            for iteration in range(self.iterations):
+                # Pheromones are fixed within an iteration, so every ant shares one weight matrix
+                weights = self._transition_weights(pheromones)
+                population, scores = self._run_ants(weights, pool)
 
-                if score < self.best_score:
-                    self.best_score = score
-                    self.best_schedule = schedule
+                best_idx = scores.argmin()
+                if scores[best_idx] < self.best_score:
+                    self.best_score = float(scores[best_idx])
+                    best_order = population[best_idx]
 
-            self._update_pheromones(pheromones, population, scores)
+                self._update_pheromones(pheromones, population, scores)
 
+        if best_order is not None:
+            self.best_schedule = [trains[i] for i in best_order]
         return self.best_schedule, self.best_score
 
-    def _construct_solution(self, trains, pheromones, priorities):
-        schedule = []
-        unvisited = set(trains)
-        current = random.choice(trains)
-        schedule.append(current)
-        unvisited.remove(current)
-
-        while unvisited:
-            probs = []
-            denom = 0.0
-
-            for t in unvisited:
-                tau = pheromones.get((current, t), 1)
-                eta = self._calculate_heuristic(priorities[current], priorities[t])
-                p = (tau ** self.alpha) * (eta ** self.beta)
-                probs.append((t, p))
-                denom += p
-
-            if denom > 0:
-                probs = [(t, p/denom) for t, p in probs]
-                current = self._roulette_wheel_selection(probs)
-            else:
-                current = random.choice(list(unvisited))
-
-            schedule.append(current)
-            unvisited.remove(current)
-
-        return schedule
-
-    def _roulette_wheel_selection(self, probs):
-        r = random.random()
-        cumulative = 0.0
-        for t, p in probs:
-            cumulative += p
-            if r <= cumulative:
-                return t
-        return probs[-1][0]
-
-    def _evaluate(self, schedule):
-        score = 0
-        priority_penalty = 100
-        conflict_penalty = 1000
-
-        # Priority inversion penalty
-        for i, ti in enumerate(schedule):
-            for j in range(i):
-                tj = schedule[j]
-                pri_i = self.trains_df.loc[self.trains_df['train_id'] == ti, 'priority'].values
-                pri_j = self.trains_df.loc[self.trains_df['train_id'] == tj, 'priority'].values
-                if pri_i.size and pri_j.size and pri_j[0] > pri_i[0]:
-                    score += priority_penalty
-
-        # Section conflict penalty
-        ts_map = {
-            row['train_id']: set(self.train_sections_df[self.train_sections_df['train_id'] == row['train_id']]['section_id'])
-            for _, row in self.trains_df.iterrows()
-        }
-        for i, ti in enumerate(schedule):
-            for j in range(i+1, len(schedule)):
-                tj = schedule[j]
-                if ts_map.get(ti, set()) & ts_map.get(tj, set()) and abs(i-j) <= 1:
-                    score += conflict_penalty
+    def _run_ants(self, weights, pool=None):
+        """Construct and score one iteration's ants - they only read pheromones, so they are independent"""
+        population = [None] * self.population_size
+        scores = np.empty(self.population_size, dtype=np.float64)
+        if pool is None:
+            for k in range(self.population_size):
+                population[k] = self._construct_solution(weights)
+                scores[k] = self._evaluate(population[k])
+            return population, scores
 
-        return score
+        # One batch of ants per worker; each batch gets its own seed so workers don't share a stream
+        batch_sizes = [len(batch) for batch in np.array_split(np.arange(self.population_size), self.max_workers)
+                       if len(batch)]
+        seeds = self.rng.integers(2**63, size=len(batch_sizes))
+        tables = (self.priority_by_pos, self.conflicts)
+        offset = 0
+        for orders, batch_scores in pool.map(_run_ant_batch, repeat(weights), repeat(tables),
+                                             batch_sizes, seeds):
+            population[offset:offset + len(orders)] = orders
+            scores[offset:offset + len(orders)] = batch_scores
+            offset += len(orders)
+        return population, scores
+
+    def _transition_weights(self, pheromones):
+        """tau^alpha * eta^beta for every (from, to) pair"""
+        return (pheromones ** np.float32(self.alpha)) * (self.eta ** np.float32(self.beta))
+
+    def _construct_solution(self, weights):
+        """Build an ant's train order (as positions) by roulette over the unvisited trains"""
+        return _construct_ant(weights, self.rng)
+
+    def _evaluate(self, order):
+        return _score_ant(order, self.priority_by_pos, self.conflicts)
 
     def _update_pheromones(self, pheromones, population, scores):
         # Evaporation
-        for key in pheromones:
-            pheromones[key] *= (1 - self.evaporation_rate)
-            if pheromones[key] < 0.1:
-                pheromones[key] = 0.1
+        pheromones *= (1 - self.evaporation_rate)
+        np.maximum(pheromones, 0.1, out=pheromones)
 
         # Deposit pheromones for best solution
-        best_idx = scores.index(min(scores))
+        best_idx = scores.argmin()
         best = population[best_idx]
-        for i in range(len(best) - 1):
-            key = (best[i], best[i+1])
-            if key in pheromones and scores[best_idx] > 0:
-                pheromones[key] += 1 / scores[best_idx]
+        if scores[best_idx] > 0:
+            pheromones[best[:-1], best[1:]] += 1 / scores[best_idx]
+
+def _evaluate_ga_individual(individual, train_index):
+    """Advanced evaluation with conflict detection, priorities, and idle time"""
+    score = 0
+    section_usage = {}  # section code -> list of (start, end)
+    priority_bonus = 0
+    prev_end = np.nan
+    
+    for order, train in enumerate(individual.tolist()):
+        section_ids, starts, ends, priority, max_end = train_index[train]
+        
+        for sec_id, start, end in zip(section_ids, starts.tolist(), ends.tolist()):
+            used = section_usage.setdefault(sec_id, [])
+            
+            # Heavy penalty for every overlap with an earlier usage of this section
+            score += 100 * sum(1 for used_start, used_end in used
+                               if not (end <= used_start or start >= used_end))
+            
+            # Record this usage
+            used.append((start, end))
+        
+        # Idle time penalty (if train waits before entering section)
+        if starts.size and not np.isnan(prev_end):
+            score += np.maximum(0, starts - prev_end).sum() * 2
+        prev_end = max_end
+        
+        # Priority bonus: reward higher priority trains scheduled earlier
+        priority_bonus += priority * (len(individual) - order)
+    
+    # Subtract bonus from total score (lower score is better)
+    score -= priority_bonus
+    return score
+
+
+def _idle_penalty(prev_train, train, train_index):
+    """Idle-time term _evaluate_ga_individual charges when `train` directly follows `prev_train`"""
+    starts, prev_end = train_index[train][1], train_index[prev_train][4]
+    if not starts.size or np.isnan(prev_end):
+        return 0.0
+    return np.maximum(0, starts - prev_end).sum() * 2
+
+def _best_insertion(order, train, train_index):
+    """Slot of `order` where inserting `train` gives the lowest _evaluate_ga_individual score
+    
+    Overlap penalties don't depend on the order, so only the idle time around the slot and
+    the priority bonus of the trains pushed back by one position differ between slots.
+    """
+    n = len(order)
+    priority = train_index[train][3]
+    
+    # Idle time gained before and after the new train, and lost between the neighbours it splits
+    idle_before = np.zeros(n + 1)
+    idle_after = np.zeros(n + 1)
+    idle_split = np.zeros(n + 1)
+    for k, neighbour in enumerate(order):
+        idle_before[k + 1] = _idle_penalty(neighbour, train, train_index)
+        idle_after[k] = _idle_penalty(train, neighbour, train_index)
+        if k:
+            idle_split[k] = _idle_penalty(order[k - 1], neighbour, train_index)
+    
+    # Trains from the slot onwards lose one position's worth of their priority bonus
+    priorities = np.array([train_index[t][3] for t in order] + [0], dtype=float)
+    suffix_priority = np.cumsum(priorities[::-1])[::-1]
+    bonus = priority * (n + 1 - np.arange(n + 1)) - suffix_priority
+    
+    return int(np.argmin(idle_before + idle_after - idle_split - bonus))
+
+def _evaluate_ga_batch(train_index, individuals):
+    """Score a slice of the population in a worker process"""
+    return [_evaluate_ga_individual(ind, train_index) for ind in individuals]
+
+# Train index of the run a GA-owned worker was started for, set once by _init_ga_worker
+_worker_train_index = None
+
+def _init_ga_worker(train_index):
+    global _worker_train_index
+    _worker_train_index = train_index
+
+def _evaluate_preloaded_ga_batch(individuals):
+    """Score a slice of the population against the train index the worker was started with"""
+    return _evaluate_ga_batch(_worker_train_index, individuals)
+
+def _distinct_pairs(rng, n, size):
+    """`size` sorted pairs of distinct ints from range(n) - a bulk random.sample(range(n), 2)"""
+    first = rng.integers(n, size=size)
+    second = rng.integers(n - 1, size=size)
+    second += second >= first
+    return np.sort(np.stack([first, second], axis=1), axis=1)
 
 class GAOptimizer:
     """Enhanced Genetic Algorithm with advanced evaluation and hybrid support"""
     
-    def __init__(self, population_size=30, generations=50, mutation_rate=0.05):
+    def __init__(self, population_size=30, generations=50, mutation_rate=0.05,
+                 parallel=False, max_workers=None, seed=None, patience=10):
         self.population_size = population_size
         self.generations = generations
         self.mutation_rate = mutation_rate
+        # Stop once the best score hasn't improved for this many generations (None runs them all)
+        self.patience = patience
+        self.parallel = parallel
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.rng = np.random.default_rng(seed)
     
     def optimize(self, trains_df: pd.DataFrame, sections_df: pd.DataFrame, 
-                 train_sections_df: pd.DataFrame, initial_population=None) -> OptimizationResult:
+                 train_sections_df: pd.DataFrame, initial_population=None, pool=None) -> OptimizationResult:
         """Optimize with optional initial population seeding"""
         
         start_time = time.time()
@@ -236,53 +375,77 @@ class GAOptimizer:
         
         try:
             trains = trains_df['train_id'].tolist()
+            train_pos = {train_id: i for i, train_id in enumerate(trains)}
+            
+            # Individuals are rows of train positions; ids are only mapped back for the output
+            population = self.rng.permuted(
+                np.tile(np.arange(len(trains), dtype=np.int32), (self.population_size, 1)), axis=1
+            )
             
-            # Use initial population if provided (for hybrid approaches)
+            # Use initial population if provided (for hybrid approaches); the rest stay random
             if initial_population is not None and len(initial_population) > 0:
-                population = []
-                for individual in initial_population[:self.population_size]:
-                    if isinstance(individual, list) and all(isinstance(x, str) for x in individual):
-                        population.append(individual)
-                
-                # Fill remaining slots if needed
-                while len(population) < self.population_size:
-                    population.append(random.sample(trains, len(trains)))
-            else:
-                # Create random population
-                population = [random.sample(trains, len(trains)) for _ in range(self.population_size)]
+                seeds = [individual for individual in initial_population[:self.population_size]
+                         if isinstance(individual, list) and all(isinstance(x, str) for x in individual)
+                         and len(individual) == len(trains) and set(individual) == train_pos.keys()]
+                for k, individual in enumerate(seeds):
+                    population[k] = [train_pos[train_id] for train_id in individual]
             
             best_individual = None
             best_score = float('inf')
+            stale_generations = 0
             fitness_history = []
             
-            for generation in range(self.generations):
-                # Evaluate all individuals
-                scores = [self._evaluate(ind, train_sections_df) for ind in population]
+            # Index section usage per train once; _evaluate only does array lookups
+            train_index = self._index_train_sections(trains, train_sections_df)
+            
+            # One worker pool for the whole run - spawning per generation costs more than it saves.
+            # A pool handed in by the caller is borrowed and left running. A pool of our own gets
+            # the train index once at startup, so generations only ship the individuals.
+            preloaded = pool is None and self.parallel
+            if pool is not None:
+                executor = nullcontext(pool)
+            elif self.parallel:
+                executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_ga_worker,
+                                               initargs=(train_index,))
+            else:
+                executor = nullcontext()
+            
+            with executor as pool:
+                for generation in range(self.generations):
+                    # Evaluate all individuals
+                    scores = self._evaluate_population(population, train_index, pool, preloaded)
+                
+                    # Track best solution
+                    best_gen_idx = scores.argmin()
+                    if scores[best_gen_idx] < best_score:
+                        best_score = float(scores[best_gen_idx])
+                        best_individual = population[best_gen_idx].copy()
+                        stale_generations = 0
+                    else:
+                        stale_generations += 1
                 
-                # Track best solution
-                best_gen_idx = np.argmin(scores)
-                if scores[best_gen_idx] < best_score:
-                    best_score = scores[best_gen_idx]
-                    best_individual = population[best_gen_idx].copy()
+                    fitness_history.append(best_score)
+                    if self.patience is not None and stale_generations >= self.patience:
+                        break
                 
-                fitness_history.append(best_score)
+                    # Selection, crossover, and mutation
+                    selected = self._selection(population, scores)
+                    n_pairs = self.population_size // 2
+                    next_population = np.empty((2 * n_pairs, len(trains)), dtype=np.int32)
                 
-                # Selection, crossover, and mutation
-                selected = self._selection(population, scores)
-                next_population = []
+                    # Draw the generation's parents and cut points in bulk
+                    parents = _distinct_pairs(self.rng, len(selected), n_pairs)
+                    cuts = _distinct_pairs(self.rng, len(trains), n_pairs)
                 
-                for i in range(self.population_size // 2):
-                    parent1, parent2 = random.sample(selected, 2)
-                    child1, child2 = self._crossover(parent1, parent2)
-                    next_population.extend([
-                        self._mutate(child1),
-                        self._mutate(child2)
-                    ])
+                    for i in range(0, len(next_population), 2):
+                        parent1, parent2 = selected[parents[i // 2, 0]], selected[parents[i // 2, 1]]
+                        next_population[i], next_population[i + 1] = self._crossover(parent1, parent2, cuts[i // 2])
                 
-                population = next_population[:self.population_size]
+                    population = self._mutate(next_population)
             
             # Convert to schedule format
-            schedule_dict = self._convert_to_schedule_format(best_individual, trains_df, train_sections_df)
+            best_order = [trains[i] for i in best_individual]
+            schedule_dict = self._convert_to_schedule_format(best_order, trains_df, train_sections_df)
             
             result.schedule = schedule_dict
             result.total_delay = best_score
@@ -298,118 +461,120 @@ class GAOptimizer:
         result.computation_time = time.time() - start_time
         return result
     
-    def _evaluate(self, individual, train_sections_df):
-        """Advanced evaluation with conflict detection, priorities, and idle time"""
-        score = 0
-        section_usage = {}  # section_id -> list of (start, end)
-        priority_bonus = 0
+    def _index_train_sections(self, trains, train_sections_df):
+        """Per train position, its section usage as (section codes, starts, ends, priority, max_end)"""
+        n_rows = len(train_sections_df)
+        starts = (train_sections_df['start_time'].to_numpy(dtype=float)
+                  if 'start_time' in train_sections_df.columns else np.zeros(n_rows))
+        ends = (train_sections_df['end_time'].to_numpy(dtype=float)
+                if 'end_time' in train_sections_df.columns else np.zeros(n_rows))
+        has_priority = 'priority' in train_sections_df.columns
+        section_ids = pd.factorize(train_sections_df['section_id'])[0]
         
-        for order, train_id in enumerate(individual):
-            train_sections = train_sections_df[train_sections_df['train_id'] == train_id]
-            
-            # Get priority (default to 1 if not available)
-            priority = train_sections['priority'].iloc[0] if 'priority' in train_sections.columns else 1
-            
-            for _, row in train_sections.iterrows():
-                sec_id = row['section_id']
-                start = row.get('start_time', 0)
-                end = row.get('end_time', 0)
-                
-                # Initialize section usage tracking
-                if sec_id not in section_usage:
-                    section_usage[sec_id] = []
-                
-                # Check for conflicts in this section
-                for (used_start, used_end) in section_usage[sec_id]:
-                    # Heavy penalty for overlap conflicts
-                    if not (end <= used_start or start >= used_end):
-                        score += 100  # Large penalty for conflict
-                
-                # Record this usage
-                section_usage[sec_id].append((start, end))
-                
-                # Idle time penalty (if train waits before entering section)
-                if order > 0:
-                    prev_train_id = individual[order - 1]
-                    prev_sections = train_sections_df[train_sections_df['train_id'] == prev_train_id]
-                    prev_end = prev_sections.get('end_time', pd.Series([0])).max()
-                    idle_time = max(0, start - prev_end)
-                    score += idle_time * 2  # Penalty for idle time
-            
-            # Priority bonus: reward higher priority trains scheduled earlier
-            priority_bonus += priority * (len(individual) - order)
+        train_index = {}
+        for train_id, rows in train_sections_df.groupby('train_id', sort=False).indices.items():
+            priority = train_sections_df['priority'].iat[rows[0]] if has_priority else 1
+            train_ends = ends[rows]
+            train_index[train_id] = (section_ids[rows].tolist(), starts[rows], train_ends,
+                                     priority, train_ends.max())
+        no_sections = ([], np.zeros(0), np.zeros(0), 1, np.nan)
+        return [train_index.get(train_id, no_sections) for train_id in trains]
+    
+    def _evaluate_population(self, population, train_index, pool=None, preloaded=False):
+        """Score every individual, fanning out to worker processes when a pool is available"""
+        scores = np.empty(len(population), dtype=np.float64)
+        if pool is None:
+            for k, ind in enumerate(population):
+                scores[k] = self._evaluate(ind, train_index)
+            return scores
         
-        # Subtract bonus from total score (lower score is better)
-        score -= priority_bonus
-        return score
+        # One batch per worker, so a borrowed pool gets the train index once per worker per generation
+        batch_size = -(-len(population) // self.max_workers)
+        batches = [population[i:i + batch_size] for i in range(0, len(population), batch_size)]
+        batch_results = (pool.map(_evaluate_preloaded_ga_batch, batches) if preloaded
+                         else pool.map(_evaluate_ga_batch, repeat(train_index), batches))
+        for i, batch_scores in zip(range(0, len(population), batch_size), batch_results):
+            scores[i:i + len(batch_scores)] = batch_scores
+        return scores
     
-    def _selection(self, population, scores):
-        """Select best half of population"""
-        idx_sorted = np.argsort(scores)
-        selected = [population[i] for i in idx_sorted[:len(population)//2]]
-        return selected
+    def _evaluate(self, individual, train_index):
+        """Advanced evaluation with conflict detection, priorities, and idle time"""
+        return _evaluate_ga_individual(individual, train_index)
+    
+    def _selection(self, population, scores, tournament_size=3):
+        """Fill half the population with winners of k-way tournaments"""
+        n = len(population)
+        scores_arr = np.asarray(scores)
+        contenders = self.rng.integers(0, n, size=(n // 2, tournament_size))
+        winners = contenders[np.arange(n // 2), scores_arr[contenders].argmin(axis=1)]
+        return population[winners]
     
-    def _crossover(self, parent1, parent2):
+    def _crossover(self, parent1, parent2, cut=None):
         """Order crossover preserving train sequence"""
         size = len(parent1)
-        p1, p2 = sorted(random.sample(range(size), 2))
+        p1, p2 = cut if cut is not None else _distinct_pairs(self.rng, size, 1)[0]
+        
+        window1, window2 = parent1[p1:p2], parent2[p1:p2]
+        # Window membership as boolean masks over train positions
+        in_window1, in_window2 = np.zeros(size, dtype=bool), np.zeros(size, dtype=bool)
+        in_window1[window1] = True
+        in_window2[window2] = True
         
-        child1 = parent1[p1:p2] + [t for t in parent2 if t not in parent1[p1:p2]]
-        child2 = parent2[p1:p2] + [t for t in parent1 if t not in parent2[p1:p2]]
+        child1 = np.concatenate([window1, parent2[~in_window1[parent2]]])
+        child2 = np.concatenate([window2, parent1[~in_window2[parent1]]])
         
         return child1, child2
     
-    def _mutate(self, individual):
-        """Swap mutation"""
-        if random.random() < self.mutation_rate:
-            i, j = random.sample(range(len(individual)), 2)
-            individual[i], individual[j] = individual[j], individual[i]
-        return individual
+    def _mutate(self, population):
+        """Swap mutation for a whole generation - one draw picks the mutants, another their swaps"""
+        mutants = np.flatnonzero(self.rng.random(len(population)) < self.mutation_rate)
+        i, j = _distinct_pairs(self.rng, population.shape[1], mutants.size).T
+        population[mutants, i], population[mutants, j] = population[mutants, j], population[mutants, i]
+        return population
     
     def _convert_to_schedule_format(self, individual, trains_df, train_sections_df):
         """Convert GA individual to standard schedule format"""
         schedule_dict = {}
+        sections_by_train = _section_records_by_train(train_sections_df, ('start_time',), ('end_time',))
         
         for order, train_id in enumerate(individual):
-            train_schedule = []
-            train_sections = train_sections_df[train_sections_df['train_id'] == train_id]
-            
             # Calculate delay based on position and conflicts
             base_delay = order * 1.5  # Position-based delay
             
-            for _, section in train_sections.iterrows():
-                train_schedule.append({
-                    'section_id': section['section_id'],
-                    'entry_time': section.get('start_time', 0),
-                    'exit_time': section.get('end_time', 0),
-                    'delay_added': base_delay
-                })
-            
-            schedule_dict[train_id] = train_schedule
+            schedule_dict[train_id] = [{**section, 'delay_added': base_delay}
+                                       for section in sections_by_train.get(train_id, [])]
         
         return schedule_dict
 
 class ComprehensiveHybridOptimizer:
     """3-stage hybrid optimizer: Heuristic → ACO → GA"""
     
-    def __init__(self, heuristic_params=None, aco_params=None, ga_params=None):
+    def __init__(self, heuristic_params=None, aco_params=None, ga_params=None,
+                 parallel=False, max_workers=None, seed=None):
         self.heuristic_params = heuristic_params or {}
         self.aco_params = aco_params or {'population_size': 20, 'iterations': 30}
         self.ga_params = ga_params or {'population_size': 30, 'generations': 40}
+        self.parallel = parallel
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.rng = np.random.default_rng(seed)
     
     def optimize(self, trains_df: pd.DataFrame, sections_df: pd.DataFrame, 
-                train_sections_df: pd.DataFrame) -> OptimizationResult:
-        """Run comprehensive 3-stage hybrid optimization"""
+                train_sections_df: pd.DataFrame, warm_start=None) -> OptimizationResult:
+        """Run comprehensive 3-stage hybrid optimization, optionally seeded with a previous schedule"""
         
         start_time = time.time()
         result = OptimizationResult("Comprehensive Hybrid (Heuristic → ACO → GA)")
+        # Single worker pool shared by every parallel stage, so workers are only spawned once
+        pool = ProcessPoolExecutor(max_workers=self.max_workers) if self.parallel else None
+        # Each stage gets its own stream derived from the hybrid's seed
+        heuristic_seed, aco_seed, ga_seed = self.rng.integers(2**63, size=3)
         
         try:
             print("   🚀 Starting 3-Stage Hybrid Optimization...")
             
             # Stage 1: Heuristic (fast baseline)
             print("   📋 Stage 1: Running Heuristic Optimizer...")
-            heuristic_optimizer = SimpleHeuristicOptimizer(**self.heuristic_params)
+            heuristic_optimizer = SimpleHeuristicOptimizer(**{'seed': heuristic_seed, **self.heuristic_params})
             heuristic_result = heuristic_optimizer.optimize(trains_df, sections_df, train_sections_df)
             
             if heuristic_result.success:
@@ -421,9 +586,9 @@ class ComprehensiveHybridOptimizer:
             
             # Stage 2: ACO (seeded by heuristic)
             print("   🐜 Stage 2: Running ACO Optimizer (seeded)...")
-            aco_optimizer = ACOOptimizer(**self.aco_params)
+            aco_optimizer = ACOOptimizer(**{'max_workers': self.max_workers, 'seed': aco_seed, **self.aco_params})
             aco_schedule, aco_score = aco_optimizer.optimize(trains_df, sections_df, train_sections_df, 
-                                                           seed_solution=heuristic_schedule)
+                                                           seed_solution=heuristic_schedule, pool=pool)
             
             if aco_schedule and aco_score < float('inf'):
                 print(f"   ✅ ACO improvement: {aco_score:.1f} delay")
@@ -434,7 +599,7 @@ class ComprehensiveHybridOptimizer:
             
             # Stage 3: GA (seeded by both heuristic and ACO)
             print("   🧬 Stage 3: Running GA Optimizer (multi-seeded)...")
-            ga_optimizer = GAOptimizer(**self.ga_params)
+            ga_optimizer = GAOptimizer(**{'max_workers': self.max_workers, 'seed': ga_seed, **self.ga_params})
             
             # Create initial population with both seeds
             initial_population = []
@@ -442,9 +607,14 @@ class ComprehensiveHybridOptimizer:
                 initial_population.append(aco_schedule)
             if heuristic_schedule and heuristic_schedule != aco_schedule:
                 initial_population.append(heuristic_schedule)
+            # A previous solution on nearly the same data (e.g. before a disruption) is usually a
+            # strong incumbent, so it joins the seeds
+            warm_start_schedule = self._extract_train_order_from_schedule(warm_start, trains_df)
+            if warm_start_schedule and warm_start_schedule not in initial_population:
+                initial_population.append(warm_start_schedule)
             
             ga_result = ga_optimizer.optimize(trains_df, sections_df, train_sections_df, 
-                                            initial_population=initial_population)
+                                            initial_population=initial_population, pool=pool)
             
             # Stage 4: Return best result
             if ga_result.success:
@@ -478,6 +648,52 @@ class ComprehensiveHybridOptimizer:
         except Exception as e:
             print(f"   ❌ Comprehensive Hybrid optimization failed: {e}")
             result.success = False
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        
+        result.computation_time = time.time() - start_time
+        return result
+    
+    def reoptimize(self, trains_df: pd.DataFrame, sections_df: pd.DataFrame, train_sections_df: pd.DataFrame,
+                   previous_schedule, affected_trains) -> OptimizationResult:
+        """Re-place only the affected trains in a previous schedule, keeping the others' order"""
+        if not previous_schedule:
+            return self.optimize(trains_df, sections_df, train_sections_df)
+        
+        start_time = time.time()
+        result = OptimizationResult("Comprehensive Hybrid (Delta Re-optimization)")
+        
+        try:
+            ga_optimizer = GAOptimizer(**self.ga_params)
+            trains = trains_df['train_id'].tolist()
+            train_pos = {train_id: i for i, train_id in enumerate(trains)}
+            train_index = ga_optimizer._index_train_sections(trains, train_sections_df)
+            
+            affected = set(affected_trains)
+            previous_order = self._extract_train_order_from_schedule(previous_schedule, trains_df)
+            order = [train_pos[train_id] for train_id in previous_order if train_id not in affected]
+            
+            # Greedy insertion: each affected train goes to the slot with the best GA fitness,
+            # instead of a full three-stage run
+            evaluations = 0
+            for train_id in previous_order:
+                if train_id not in affected:
+                    continue
+                slot = _best_insertion(order, train_pos[train_id], train_index)
+                order.insert(slot, train_pos[train_id])
+                evaluations += len(order)
+            
+            best_order = [trains[i] for i in order]
+            result.schedule = ga_optimizer._convert_to_schedule_format(best_order, trains_df, train_sections_df)
+            result.total_delay = float(ga_optimizer._evaluate(np.asarray(order, dtype=np.int32), train_index))
+            result.throughput = len(trains_df)
+            result.conflicts_resolved = evaluations
+            result.success = True
+            
+        except Exception as e:
+            print(f"   ❌ Delta re-optimization failed: {e}")
+            result.success = False
         
         result.computation_time = time.time() - start_time
         return result
@@ -506,23 +722,14 @@ class ComprehensiveHybridOptimizer:
     def _convert_aco_schedule_to_dict(self, train_order, trains_df, train_sections_df):
         """Convert ACO train order to schedule dictionary format"""
         schedule_dict = {}
+        sections_by_train = _section_records_by_train(train_sections_df, ('start_time',), ('end_time',))
         
         for order, train_id in enumerate(train_order):
-            train_schedule = []
-            train_sections = train_sections_df[train_sections_df['train_id'] == train_id]
-            
             # Calculate delay based on position in schedule
             base_delay = order * 2  # Simple delay calculation
             
-            for _, section in train_sections.iterrows():
-                train_schedule.append({
-                    'section_id': section['section_id'],
-                    'entry_time': section.get('start_time', 0),
-                    'exit_time': section.get('end_time', 0),
-                    'delay_added': base_delay
-                })
-            
-            schedule_dict[train_id] = train_schedule
+            schedule_dict[train_id] = [{**section, 'delay_added': base_delay}
+                                       for section in sections_by_train.get(train_id, [])]
         
         return schedule_dict
 
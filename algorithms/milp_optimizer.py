@@ -1,87 +1,123 @@
+import json
+import os
 import pulp
 import pandas as pd
+from itertools import combinations
+
+# Solver settings picked by tune_milp.py for this workload, keyed by PuLP solver name
+TUNED_OPTIONS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'milp_tuned_options.json')
 
 class MILPOptimizer:
-    def __init__(self, max_block_time=10, time_limit=30):
+    def __init__(self, max_block_time=10, time_limit=30, solver_options=None):
         self.max_block_time = max_block_time
         self.time_limit = time_limit  # solver time limit in seconds
-
-    def _time_to_minutes(self, time_str):
-        h, m = map(int, time_str.split(':'))
-        return h * 60 + m
-
-    def optimize(self, trains_df, sections_df, train_sections_df):
+        # Extra solver keyword arguments per solver name; defaults to the tuned file if present
+        self.solver_options = solver_options if solver_options is not None else self._load_tuned_options()
+
+    def _load_tuned_options(self):
+        try:
+            with open(TUNED_OPTIONS_PATH) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _times_to_minutes(self, times):
+        """Minutes since midnight for a column of HH:MM strings"""
+        parsed = pd.to_datetime(times, format='%H:%M')
+        return parsed.dt.hour * 60 + parsed.dt.minute
+
+    def optimize(self, trains_df, sections_df, train_sections_df, warm_start=None):
         # Limit data size for testing speed
         trains_df = trains_df.head(10)
         sections_df = sections_df.head(50)
         train_sections_df = train_sections_df[train_sections_df['train_id'].isin(trains_df['train_id'])]
 
         model = pulp.LpProblem("Train_Scheduling_Optimization", pulp.LpMinimize)
-        trains = trains_df['train_id'].tolist()
         sections = sections_df['section_id'].tolist()
 
-        schedule_vars = {}
-        for _, row in train_sections_df.iterrows():
-            var_name = f"start_{row['train_id']}_{row['section_id']}"
-            schedule_vars[(row['train_id'], row['section_id'])] = pulp.LpVariable(var_name, lowBound=0)
+        # Start times live within one day plus the worst current delay. Bounding the variables
+        # to that horizon lets the disjunctions below use a big-M that is just wide enough
+        max_delay = trains_df['delay_minutes'].max() if 'delay_minutes' in trains_df else 0
+        horizon = 24 * 60 + (int(max_delay) if pd.notna(max_delay) and max_delay > 0 else 0)
+
+        # One row per (train, section); its scheduled entry is the delay target for that visit
+        first_visits = train_sections_df.drop_duplicates(['train_id', 'section_id'])
+        scheduled_minutes = self._times_to_minutes(first_visits['scheduled_entry_time'])
+
+        # Variables are named by small-int train/section codes: PuLP parses every name, and the
+        # codes keep them short and free of characters it would have to escape
+        train_codes, _ = pd.factorize(first_visits['train_id'])
+        section_codes, _ = pd.factorize(first_visits['section_id'])
+        var_codes = dict(zip(zip(first_visits['train_id'], first_visits['section_id']),
+                             zip(train_codes.tolist(), section_codes.tolist())))
 
+        # Start times of a previous solve (same format as the returned schedule); seeding every
+        # variable from them gives branch-and-bound a near-feasible incumbent to prune against
+        initial_starts = {(train_id, visit['section_id']): visit['start_time']
+                          for train_id, visits in (warm_start or {}).items() for visit in visits
+                          if visit.get('start_time') is not None}
+
+        schedule_vars = {}
         total_delay_vars = []
-        for (train_id, section_id), var in schedule_vars.items():
-            scheduled_str = train_sections_df[
-                (train_sections_df['train_id'] == train_id) &
-                (train_sections_df['section_id'] == section_id)
-            ]['scheduled_entry_time'].values[0]
-            scheduled_time = self._time_to_minutes(scheduled_str)
+        for (key, (i, j)), scheduled_time in zip(var_codes.items(), scheduled_minutes):
+            var = pulp.LpVariable(f"s_{i}_{j}", lowBound=0, upBound=horizon)
+            schedule_vars[key] = var
 
-            delay_var = pulp.LpVariable(f"delay_{train_id}_{section_id}", lowBound=0)
+            delay_var = pulp.LpVariable(f"d_{i}_{j}", lowBound=0)
             model += delay_var >= var - scheduled_time
             model += delay_var >= 0
             total_delay_vars.append(delay_var)
 
+            if key in initial_starts:
+                var.setInitialValue(initial_starts[key])
+                delay_var.setInitialValue(max(0, initial_starts[key] - scheduled_time))
+
         model += pulp.lpSum(total_delay_vars), "Minimize_Total_Delay"
 
-        M = 1e5
+        # Any two starts differ by at most the horizon, so this M never cuts off a feasible order
+        # while keeping the LP relaxation far tighter than a blanket 1e5
+        M = horizon + self.max_block_time
+
+        # Trains on each section in order of first appearance, grouped once for every block below
+        trains_by_section = first_visits.groupby('section_id', sort=False)['train_id'].apply(list).to_dict()
 
-        # Conflict constraints: no two trains on same section at the same time
+        # Conflict constraints: no two trains on same section at the same time. Junction sections
+        # are among these, so the one disjunction per pair also covers the junction ordering
         for section in sections:
-            trains_on_section = train_sections_df[train_sections_df['section_id'] == section]['train_id'].unique()
-            for i in range(len(trains_on_section)):
-                for j in range(i+1, len(trains_on_section)):
-                    t1, t2 = trains_on_section[i], trains_on_section[j]
-                    s1 = schedule_vars[(t1, section)]
-                    s2 = schedule_vars[(t2, section)]
-                    b = pulp.LpVariable(f"order_{t1}_{t2}_{section}", cat='Binary')
-                    model += s1 + self.max_block_time <= s2 + M * (1 - b)
-                    model += s2 + self.max_block_time <= s1 + M * b
-
-        # Junction constraints example
-        junction_sections = sections_df[sections_df['junction_flag'] == 1]['section_id'].tolist()
-        for junction in junction_sections:
-            trains_on_junction = train_sections_df[train_sections_df['section_id'] == junction]['train_id'].unique()
-            for i in range(len(trains_on_junction)):
-                for j in range(i+1, len(trains_on_junction)):
-                    t1, t2 = trains_on_junction[i], trains_on_junction[j]
-                    s1 = schedule_vars[(t1, junction)]
-                    s2 = schedule_vars[(t2, junction)]
-                    b = pulp.LpVariable(f"junction_order_{t1}_{t2}_{junction}", cat='Binary')
-                    model += s1 + self.max_block_time <= s2 + M * (1 - b)
-                    model += s2 + self.max_block_time <= s1 + M * b
+            for t1, t2 in combinations(trains_by_section.get(section, []), 2):
+                s1 = schedule_vars[(t1, section)]
+                s2 = schedule_vars[(t2, section)]
+                i1, j = var_codes[(t1, section)]
+                i2, _ = var_codes[(t2, section)]
+                b = pulp.LpVariable(f"o_{i1}_{i2}_{j}", cat='Binary')
+                if (t1, section) in initial_starts and (t2, section) in initial_starts:
+                    b.setInitialValue(int(initial_starts[(t1, section)] <= initial_starts[(t2, section)]))
+                model += s1 + self.max_block_time <= s2 + M * (1 - b)
+                model += s2 + self.max_block_time <= s1 + M * b
 
         # Enforce train priorities (higher priority trains depart earlier)
-        priority_map = {tid: self._get_priority_score(trains_df, tid) for tid in trains}
+        # One pass over the priority column instead of a boolean-mask lookup per train; the first
+        # row wins for a repeated train_id, as it did with the per-train lookup
+        first_rows = trains_df.drop_duplicates('train_id')
+        priority_map = dict(zip(first_rows['train_id'], first_rows['priority'].astype(float)))
         for section in sections:
-            trains_on_section = train_sections_df[train_sections_df['section_id'] == section]['train_id'].unique()
-            for t1 in trains_on_section:
-                for t2 in trains_on_section:
-                    if t1 == t2:
-                        continue
-                    if priority_map.get(t1, 5.0) < priority_map.get(t2, 5.0):
-                        s1 = schedule_vars[(t1, section)]
-                        s2 = schedule_vars[(t2, section)]
-                        model += s1 <= s2
-
-        solver = pulp.PULP_CBC_CMD(msg=True, timeLimit=self.time_limit)
-        status = model.solve(solver)
+            trains_by_priority = {}
+            for t in trains_by_section.get(section, []):
+                trains_by_priority.setdefault(priority_map.get(t, 5.0), []).append(t)
+            levels = sorted(p for p in trains_by_priority if not pd.isna(p))
+
+            # Every train of one level starts no later than every train of the next. A split variable
+            # between adjacent levels gives O(T) constraints instead of one per pair; the ordering
+            # across non-adjacent levels follows by transitivity.
+            for k, (higher, lower) in enumerate(zip(levels, levels[1:])):
+                _, j = var_codes[(trains_by_priority[higher][0], section)]
+                split = pulp.LpVariable(f"p_{j}_{k}", lowBound=0)
+                for t in trains_by_priority[higher]:
+                    model += schedule_vars[(t, section)] <= split
+                for t in trains_by_priority[lower]:
+                    model += split <= schedule_vars[(t, section)]
+
+        status = model.solve(self._make_solver(warm_start=bool(initial_starts)))
 
         if status != pulp.LpStatusOptimal:
             print("No optimal solution found within time limit.")
@@ -97,8 +133,14 @@ class MILPOptimizer:
 
         return schedule
 
-    def _get_priority_score(self, trains_df, train_id):
-        train_row = trains_df[trains_df['train_id'] == train_id]
-        if not train_row.empty:
-            return float(train_row['priority'].values[0])
-        return 5.0  # default priority
+    def _make_solver(self, warm_start=False):
+        # HiGHS is considerably faster than CBC on these big-M ordering models; use it (in-process
+        # via highspy, else its CLI) when installed, and fall back to the CBC that ships with PuLP.
+        # Initial values are only handed to the command-line solvers; highspy starts cold
+        for solver_class, kwargs in ((pulp.HiGHS, {}), (pulp.HiGHS_CMD, {'warmStart': warm_start})):
+            solver = solver_class(msg=True, timeLimit=self.time_limit, **kwargs,
+                                  **self.solver_options.get(solver_class.name, {}))
+            if solver.available():
+                return solver
+        return pulp.PULP_CBC_CMD(msg=True, timeLimit=self.time_limit, warmStart=warm_start,
+                                 **self.solver_options.get(pulp.PULP_CBC_CMD.name, {}))
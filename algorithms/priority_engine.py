@@ -2,137 +2,180 @@
 Priority Engine for Train Traffic Optimization
 Handles train priority decisions based on Indian Railways classification
 """
+import numpy as np
 import pandas as pd
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Optional
+from algorithms._priority_kernels import score_all
+
+_DEFAULT_PRIORITY = 4
+
+# Peak hours: 7-10 AM, 5-8 PM
+_PEAK_HOURS = frozenset(range(7, 11)) | frozenset(range(17, 21))
+
+@lru_cache(maxsize=32)
+def _hour_period(hour: int) -> str:
+    """Map an hour to its time_multipliers key"""
+    if hour in _PEAK_HOURS:
+        return 'peak_hours'
+    # Night hours: 11 PM - 5 AM
+    elif hour >= 23 or hour <= 5:
+        return 'night_hours'
+    return 'normal_hours'
+
+@lru_cache(maxsize=4096)
+def _start_period(time_str) -> Optional[str]:
+    """time_multipliers key for an 'HH:MM' start time, or None if the time can't be parsed"""
+    try:
+        hour = int(time_str.split(':', 1)[0])
+    except (AttributeError, TypeError, ValueError):
+        return None
+    return _hour_period(hour)
+
+@lru_cache(maxsize=4096, typed=True)
+def _priority_explanation(train_type, base_priority, delay, hour: int) -> str:
+    """Explanation text for one combination of the fields it mentions"""
+    # typed=True: a delay of 5 and of 5.0 render differently, so they must not share an entry
+    explanation = f"Train Type: {train_type} (Priority Level {base_priority})"
+    
+    if delay > 0:
+        explanation += f" | Delayed by {delay} minutes"
+    
+    period = _hour_period(hour)
+    if period == 'peak_hours':
+        explanation += " | Peak hours - Higher priority"
+    elif period == 'night_hours':
+        explanation += " | Night hours - Lower priority"
+    
+    return explanation
 
 class PriorityEngine:
     """Handles train priority and precedence decisions"""
     
-    def __init__(self):
-        # Indian Railways Priority Matrix
-        self.train_type_priority = {
-            'Rajdhani': 1,       # Highest priority
-            'Shatabdi': 1,      
-            'Vande Bharat': 1,
-            'Duronto': 2,
-            'Express': 3,
-            'Mail': 3,
-            'Superfast': 3,
-            'Passenger': 4,
-            'Local': 5,
-            'Freight': 6,        # Lowest priority
-            'MEMU': 5,
-            'DEMU': 5
-        }
-        
-        # Time-based priority adjustments
-        self.time_multipliers = {
-            'peak_hours': 0.8,       # Higher priority during peak
-            'night_hours': 1.2,      # Lower priority at night
-            'normal_hours': 1.0
-        }
+    # Indian Railways Priority Matrix (shared by every instance)
+    train_type_priority = {
+        'Rajdhani': 1,       # Highest priority
+        'Shatabdi': 1,      
+        'Vande Bharat': 1,
+        'Duronto': 2,
+        'Express': 3,
+        'Mail': 3,
+        'Superfast': 3,
+        'Passenger': 4,
+        'Local': 5,
+        'Freight': 6,        # Lowest priority
+        'MEMU': 5,
+        'DEMU': 5
+    }
+    
+    # Time-based priority adjustments
+    time_multipliers = {
+        'peak_hours': 0.8,       # Higher priority during peak
+        'night_hours': 1.2,      # Lower priority at night
+        'normal_hours': 1.0
+    }
     
     def get_train_priority(self, train_info: Dict) -> float:
         """Calculate final priority score for a train"""
         
-        base_priority = self.train_type_priority.get(train_info.get('train_type', 'Passenger'), 4)
+        # A missing train_type means Passenger, which is also the default level
+        base_priority = self.train_type_priority.get(train_info.get('train_type'), _DEFAULT_PRIORITY)
         
         # Add custom priority if specified
         if 'priority' in train_info:
             base_priority = min(base_priority, train_info['priority'])
         
         # Time-based adjustment
-        scheduled_time = train_info.get('scheduled_start_time', '12:00')
-        time_factor = self._get_time_factor(scheduled_time)
+        time_factor = self._get_time_factor(train_info.get('scheduled_start_time', '12:00'))
         
         # Delay penalty (delayed trains get slightly lower priority)
         delay_penalty = min(train_info.get('delay_minutes', 0) * 0.01, 0.5)
         
-        final_priority = base_priority * time_factor + delay_penalty
-        
-        return final_priority
+        return base_priority * time_factor + delay_penalty
     
     def _get_time_factor(self, time_str: str) -> float:
         """Get time-based priority multiplier"""
+        # Start times repeat across trains and calls, so the parse is cached per distinct string;
+        # the multiplier is looked up per call so subclasses can still override time_multipliers
         try:
-            hour = int(time_str.split(':')[0])
-            
-            # Peak hours: 7-10 AM, 5-8 PM
-            if (7 <= hour <= 10) or (17 <= hour <= 20):
-                return self.time_multipliers['peak_hours']
-            # Night hours: 11 PM - 5 AM
-            elif hour >= 23 or hour <= 5:
-                return self.time_multipliers['night_hours']
-            else:
-                return self.time_multipliers['normal_hours']
-                
-        except:
+            period = _start_period(time_str)
+        except TypeError:  # unhashable, so not an 'HH:MM' string either
+            period = None
+        if period is None:
             return 1.0
+        
+        return self.time_multipliers[period]
     
     def resolve_conflict(self, train_a: Dict, train_b: Dict) -> str:
         """Decide which train gets priority in a conflict"""
         
-        priority_a = self.get_train_priority(train_a)
-        priority_b = self.get_train_priority(train_b)
-        
-        # Lower number = higher priority
-        if priority_a < priority_b:
-            return train_a['train_id']
-        elif priority_b < priority_a:
-            return train_b['train_id']
-        else:
-            # Equal priority - use scheduled time as tiebreaker
-            time_a = train_a.get('scheduled_start_time', '12:00')
-            time_b = train_b.get('scheduled_start_time', '12:00')
-            
-            if time_a <= time_b:
-                return train_a['train_id']
-            else:
-                return train_b['train_id']
+        # Lower number = higher priority; equal priority falls back to the earlier scheduled time
+        key_a = (self.get_train_priority(train_a), train_a.get('scheduled_start_time', '12:00'))
+        key_b = (self.get_train_priority(train_b), train_b.get('scheduled_start_time', '12:00'))
+        return train_a['train_id'] if key_a <= key_b else train_b['train_id']
     
     def get_priority_explanation(self, train_info: Dict) -> str:
         """Get human-readable explanation of priority decision"""
         
         train_type = train_info.get('train_type', 'Unknown')
-        base_priority = self.train_type_priority.get(train_type, 4)
+        base_priority = self.train_type_priority.get(train_type, _DEFAULT_PRIORITY)
         delay = train_info.get('delay_minutes', 0)
         
-        explanation = f"Train Type: {train_type} (Priority Level {base_priority})"
-        
-        if delay > 0:
-            explanation += f" | Delayed by {delay} minutes"
-        
         scheduled_time = train_info.get('scheduled_start_time', '12:00')
         hour = int(scheduled_time.split(':')[0])
         
-        if (7 <= hour <= 10) or (17 <= hour <= 20):
-            explanation += " | Peak hours - Higher priority"
-        elif hour >= 23 or hour <= 5:
-            explanation += " | Night hours - Lower priority"
-        
-        return explanation
+        return _priority_explanation(train_type, base_priority, delay, hour)
     
     def create_priority_matrix(self, trains_df: pd.DataFrame) -> pd.DataFrame:
         """Create a priority matrix for all trains"""
         
-        priority_data = []
-        
-        for _, train in trains_df.iterrows():
-            train_dict = train.to_dict()
-            priority_score = self.get_train_priority(train_dict)
-            explanation = self.get_priority_explanation(train_dict)
-            
-            priority_data.append({
-                'train_id': train['train_id'],
-                'train_name': train.get('train_name', 'Unknown'),
-                'train_type': train.get('train_type', 'Unknown'),
-                'priority_score': priority_score,
-                'explanation': explanation,
-                'scheduled_time': train.get('scheduled_start_time', '12:00'),
-                'delay_minutes': train.get('delay_minutes', 0)
-            })
-        
-        priority_df = pd.DataFrame(priority_data)
+        def column(name, default):
+            if name in trains_df:
+                return trains_df[name].to_numpy()
+            return np.full(len(trains_df), default, dtype=object)
+        
+        train_type = column('train_type', 'Unknown')
+        scheduled_time = column('scheduled_start_time', '12:00')
+        delay = column('delay_minutes', 0)
+        
+        # Base priority by train type, overridden by an explicit (lower) priority column
+        type_priority = pd.Series(train_type, dtype=object).map(self.train_type_priority).fillna(_DEFAULT_PRIORITY).to_numpy(dtype=float)
+        base_priority = type_priority
+        if 'priority' in trains_df:
+            base_priority = np.fmin(type_priority, trains_df['priority'].to_numpy(dtype=float))
+        
+        # Hour of the scheduled start; unparseable times get the normal-hours factor
+        hour = pd.to_numeric(pd.Series(scheduled_time, dtype=object).str.split(':').str[0],
+                             errors='coerce').to_numpy()
+        peak = ((hour >= 7) & (hour <= 10)) | ((hour >= 17) & (hour <= 20))
+        night = (hour >= 23) | (hour <= 5)
+        time_factor = np.select(
+            [peak, night],
+            [self.time_multipliers['peak_hours'], self.time_multipliers['night_hours']],
+            default=self.time_multipliers['normal_hours']
+        )
+        
+        # Delay penalty (delayed trains get slightly lower priority) is applied in score_all
+        delay_values = pd.to_numeric(pd.Series(delay, dtype=object)).to_numpy(dtype=float)
+        
+        # Explanations assembled column-wise with the same wording as get_priority_explanation
+        type_str = pd.Series(train_type, dtype=object).astype(str)
+        explanation = ("Train Type: " + type_str + " (Priority Level "
+                       + type_priority.astype(int).astype(str) + ")")
+        explanation += np.where(delay_values > 0,
+                                " | Delayed by " + pd.Series(delay, dtype=object).astype(str) + " minutes", "")
+        explanation += np.select([peak, night],
+                                 [" | Peak hours - Higher priority", " | Night hours - Lower priority"], default="")
+        
+        priority_df = pd.DataFrame({
+            'train_id': trains_df['train_id'].to_numpy(),
+            'train_name': column('train_name', 'Unknown'),
+            'train_type': train_type,
+            'priority_score': score_all(base_priority, time_factor.astype(float), delay_values),
+            'explanation': explanation.to_numpy(),
+            'scheduled_time': scheduled_time,
+            'delay_minutes': delay
+        })
         priority_df = priority_df.sort_values('priority_score')
         priority_df['rank'] = range(1, len(priority_df) + 1)
         
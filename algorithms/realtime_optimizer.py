@@ -1,16 +1,21 @@
-import copy
+from functools import lru_cache
 from algorithms.comprehensive_hybrid_optimizer import ComprehensiveHybridOptimizer
 
+@lru_cache(maxsize=8)
+def _get_optimizer(aco_key, ga_key):
+    """Shared hybrid optimizer per parameter set, reused across reoptimizations"""
+    return ComprehensiveHybridOptimizer(aco_params=dict(aco_key), ga_params=dict(ga_key))
+
 class RealtimeOptimizer:
     def __init__(self):
         self.comprehensive_optimizer = ComprehensiveHybridOptimizer()
 
     def simulate_delay(self, trains_df, train_id, delay_minutes):
-        # Copy data to avoid mutation
-        disrupted_trains = copy.deepcopy(trains_df)
-        mask = disrupted_trains['train_id'] == train_id
-        disrupted_trains.loc[mask, 'delay_minutes'] += delay_minutes
-        return disrupted_trains
+        # New frame with only delay_minutes rebuilt - the input is left untouched, and object
+        # columns are shared rather than deep-copied since nothing else is modified
+        delays = trains_df['delay_minutes']
+        mask = trains_df['train_id'] == train_id
+        return trains_df.assign(delay_minutes=delays.where(~mask, delays + delay_minutes))
 
     def reoptimize(self, disrupted_trains_df, sections_df, train_sections_df):
         # Run comprehensive hybrid optimizer for speed and accuracy
@@ -19,8 +24,6 @@ class RealtimeOptimizer:
     def reoptimize_with_config(self, disrupted_trains_df, sections_df, train_sections_df, 
                               aco_params=None, ga_params=None):
         # Run comprehensive hybrid optimizer with custom parameters
-        optimizer = ComprehensiveHybridOptimizer(
-            aco_params=aco_params or {},
-            ga_params=ga_params or {}
-        )
+        optimizer = _get_optimizer(tuple(sorted((aco_params or {}).items())),
+                                   tuple(sorted((ga_params or {}).items())))
         return optimizer.optimize(disrupted_trains_df, sections_df, train_sections_df)
@@ -1,5 +1,20 @@
+import os
+import numpy as np
 import pandas as pd
 import random
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+def _unassigned_positions(mask, n):
+    """Indices of the trains still set in an unassigned-trains bitmask"""
+    bits = np.unpackbits(np.frombuffer(mask.to_bytes(n // 8 + 1, 'little'), dtype=np.uint8), bitorder='little')
+    return np.flatnonzero(bits[:n])
+
+def _train_episode_batch(agent, episodes, seed):
+    """Run a batch of episodes on a worker's private copy of the agent"""
+    random.seed(seed)
+    best_schedule, best_score = agent._run_episodes(episodes)
+    return agent.q_table, best_schedule, best_score
 
 class TrainEnv:
     def __init__(self, trains_df, train_sections_df):
@@ -8,41 +23,75 @@ class TrainEnv:
         self.state = self.reset()
 
     def reset(self):
-        self.unassigned_trains = set(self.trains)
+        # Trains are indices into self.trains; the state is the bitmask of unassigned ones
+        self.unassigned_trains = (1 << len(self.trains)) - 1
         self.schedule = []
-        return tuple(self.unassigned_trains)
+        return self.unassigned_trains
 
-    def step(self, train_id):
-        self.unassigned_trains.remove(train_id)
-        self.schedule.append(train_id)
+    def step(self, train):
+        self.unassigned_trains &= ~(1 << train)
+        self.schedule.append(train)
         reward = -len(self.schedule)  # Negative reward to encourage shorter schedule
-        done = len(self.unassigned_trains) == 0
-        return tuple(self.unassigned_trains), reward, done
+        done = self.unassigned_trains == 0
+        return self.unassigned_trains, reward, done
 
 class RLAgent:
-    def __init__(self, trains_df, train_sections_df, alpha=0.1, gamma=0.9, epsilon=0.2):
+    def __init__(self, trains_df, train_sections_df, alpha=0.1, gamma=0.9, epsilon=0.2,
+                 parallel=False, max_workers=None):
         self.env = TrainEnv(trains_df, train_sections_df)
-        self.q_table = dict()  # state: {action: q-value}
+        self.q_table = dict()  # state bitmask: q-value per train index (-inf once assigned)
         self.alpha = alpha
         self.gamma = gamma
         self.epsilon = epsilon
+        self.parallel = parallel
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def _q_values(self, state):
+        q_values = self.q_table.get(state)
+        if q_values is None:
+            q_values = np.full(len(self.env.trains), -np.inf)
+            q_values[_unassigned_positions(state, len(self.env.trains))] = 0.0
+            self.q_table[state] = q_values
+        return q_values
 
     def choose_action(self, state):
-        actions = list(state)
         if random.random() < self.epsilon or state not in self.q_table:
-            return random.choice(actions)
-        return max(self.q_table[state], key=self.q_table[state].get)
+            return int(random.choice(_unassigned_positions(state, len(self.env.trains))))
+        return int(self.q_table[state].argmax())
 
     def update_q(self, state, action, reward, next_state):
-        if state not in self.q_table:
-            self.q_table[state] = {a: 0 for a in state}
-        if next_state not in self.q_table:
-            self.q_table[next_state] = {a: 0 for a in next_state}
-        old_value = self.q_table[state][action]
-        next_max = max(self.q_table[next_state].values()) if next_state else 0
-        self.q_table[state][action] = old_value + self.alpha * (reward + self.gamma * next_max - old_value)
+        q_values = self._q_values(state)
+        next_max = self._q_values(next_state).max() if next_state else 0
+        q_values[action] += self.alpha * (reward + self.gamma * next_max - q_values[action])
+
+    def _merge_q_table(self, q_table):
+        # Keep the best estimate per (state, action) seen by any worker
+        for state, q_values in q_table.items():
+            own = self.q_table.get(state)
+            if own is None:
+                self.q_table[state] = q_values
+            else:
+                np.maximum(own, q_values, out=own)
 
     def train(self, episodes=100):
+        if not self.parallel:
+            return self._run_episodes(episodes)
+
+        # Episodes only share the Q-table, so each worker learns on its own copy and the
+        # tables are merged afterwards
+        batch_sizes = [len(batch) for batch in np.array_split(np.arange(episodes), self.max_workers) if len(batch)]
+        seeds = [random.getrandbits(64) for _ in batch_sizes]
+        best_schedule = []
+        best_score = float('inf')
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            for q_table, schedule, score in pool.map(_train_episode_batch, repeat(self), batch_sizes, seeds):
+                self._merge_q_table(q_table)
+                if score < best_score:
+                    best_score = score
+                    best_schedule = schedule
+        return best_schedule, best_score
+
+    def _run_episodes(self, episodes):
         best_schedule = []
         best_score = float('inf')
         for ep in range(episodes):
@@ -58,7 +107,7 @@ class RLAgent:
                     break
             if total_reward < best_score:
                 best_score = total_reward
-                best_schedule = list(self.env.schedule)
+                best_schedule = [self.env.trains[i] for i in self.env.schedule]
         return best_schedule, best_score
 
 def run_rl_optimizer(trains_df, sections_df, train_sections_df):
@@ -1,42 +1,77 @@
+from collections import namedtuple
+from dataclasses import dataclass
 from typing import List, Dict
 
+import numpy as np
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+@dataclass(slots=True)
 class Train:
-    def __init__(
-        self,
-        train_id: str,
-        priority: int,
-        train_type: str,
-        length: int,
-        delay: int,
-        passenger_load: int,
-        energy_efficiency: float,
-    ):
-        self.train_id = train_id
-        self.priority = priority  # Lower number = higher priority
-        self.train_type = train_type
-        self.length = length  # in meters
-        self.delay = delay  # in minutes
-        self.passenger_load = passenger_load
-        self.energy_efficiency = energy_efficiency
+    train_id: str
+    priority: int  # Lower number = higher priority
+    train_type: str
+    length: int  # in meters
+    delay: int  # in minutes
+    passenger_load: int
+    energy_efficiency: float
 
 
+@dataclass(slots=True)
 class SectionConflict:
-    def __init__(
-        self,
-        section_id: str,
-        competing_trains: List[str],
-        signal_state: str,  # e.g. "Green", "Red", "Yellow"
-        weather_condition: str,  # e.g. "Clear", "Rain", "Fog"
-        platform_availability: Dict[str, bool],  # train_id -> bool availability
-        track_capacity: int,  # number of trains allowed simultaneously
-    ):
-        self.section_id = section_id
-        self.competing_trains = competing_trains
-        self.signal_state = signal_state
-        self.weather_condition = weather_condition
-        self.platform_availability = platform_availability
-        self.track_capacity = track_capacity
+    section_id: str
+    competing_trains: List[str]
+    signal_state: str  # e.g. "Green", "Red", "Yellow"
+    weather_condition: str  # e.g. "Clear", "Rain", "Fog"
+    platform_availability: Dict[str, bool]  # train_id -> bool availability
+    track_capacity: int  # number of trains allowed simultaneously
+
+
+WEATHER_DELAY_MINUTES = {"Clear": 0, "Rain": 2, "Fog": 5, "Storm": 10}
+SIGNAL_PENALTY = {"Red": 20, "Yellow": 10}  # red or yellow signal lowers priority
+
+
+TrainBatch = namedtuple("TrainBatch", "index base length_penalty passenger_factor energy_factor")
+
+
+def _train_batch(trains: Dict[str, Train]) -> TrainBatch:
+    """Struct-of-arrays view of the trains: one array per score term, plus train_id -> row"""
+    values = list(trains.values())
+    priority = np.array([t.priority for t in values], dtype=np.int64)
+    delay = np.array([t.delay for t in values], dtype=np.int64)
+    length = np.array([t.length for t in values], dtype=np.float64)
+    passenger_load = np.array([t.passenger_load for t in values], dtype=np.float64)
+    return TrainBatch(
+        index={tid: i for i, tid in enumerate(trains)},
+        base=priority * 10 + delay,
+        length_penalty=length / 100,  # scaled
+        passenger_factor=-passenger_load / 1000,
+        energy_factor=np.array([t.energy_efficiency for t in values], dtype=np.float64),
+    )
+
+
+def _score_loop(base, length_penalty, passenger_factor, energy_factor, idx, weather_delay, signal_penalty):
+    """Score of each train row in idx for one conflict (lower score = higher priority)"""
+    out = np.empty(idx.shape[0])
+    for k in range(idx.shape[0]):
+        i = idx[k]
+        out[k] = (base[i] + weather_delay + length_penalty[i]
+                  - passenger_factor[i] - energy_factor[i] + signal_penalty)
+    return out
+
+
+def _score_numpy(base, length_penalty, passenger_factor, energy_factor, idx, weather_delay, signal_penalty):
+    return (base[idx] + weather_delay + length_penalty[idx]
+            - passenger_factor[idx] - energy_factor[idx] + signal_penalty)
+
+
+# Compiled with numba when it is installed. No fastmath: reassociating the sum could reorder
+# near-tied trains relative to the NumPy path
+score_kernel = njit(cache=True)(_score_loop) if njit is not None else _score_numpy
 
 
 def ai_decision(
@@ -49,41 +84,36 @@ def ai_decision(
     """
     decisions = {}
 
-    weather_delay_map = {"Clear": 0, "Rain": 2, "Fog": 5, "Storm": 10}  # minutes delay
+    # Per-train score terms, computed once as arrays and indexed per conflict
+    batch = _train_batch(trains)
+    train_row = batch.index
 
     for conflict in conflicts:
-        # Filter trains that have platform available
+        # Filter trains that have platform available; the lookup is bound once per conflict
+        platform_available = conflict.platform_availability.get
         available_trains = [
             tid
             for tid in conflict.competing_trains
-            if conflict.platform_availability.get(tid, True)
+            if platform_available(tid, True)
         ]
 
         if not available_trains:
             continue  # skip if no available trains on this section
 
-        # Calculate combined score for each train factoring multiple aspects
-        def score_train(tid):
-            train = trains[tid]
-            # Base priority and delay
-            base = train.priority * 10 + train.delay
-            # Adjust for weather delay impact
-            weather_delay = weather_delay_map.get(conflict.weather_condition, 0)
-            # Adjust for train length (longer trains might cause more blockage)
-            length_penalty = train.length / 100  # scaled
-            # Passenger load and energy efficiency as factors (lower is better)
-            passenger_factor = -train.passenger_load / 1000  # prioritize more passengers
-            energy_factor = train.energy_efficiency  # higher energy efficiency preferred
-            # Signal state penalty (if signal is red or yellow, lower priority)
-            signal_penalty = 0
-            if conflict.signal_state == "Red":
-                signal_penalty = 20
-            elif conflict.signal_state == "Yellow":
-                signal_penalty = 10
-            return base + weather_delay + length_penalty - passenger_factor - energy_factor + signal_penalty
-
-        # Sort available trains by score ascending (lower score = higher priority)
-        sorted_trains = sorted(available_trains, key=score_train)
+        # Combined score for each train: priority and delay, weather delay impact, train length
+        # (longer trains block more), passenger load (more passengers first), energy efficiency
+        # (more efficient first) and the signal state
+        # Resolved to plain numbers once per conflict, so the score kernel only sees scalars and arrays
+        weather_delay = WEATHER_DELAY_MINUTES.get(conflict.weather_condition, 0)
+        signal_penalty = SIGNAL_PENALTY.get(conflict.signal_state, 0)
+        idx = np.fromiter((train_row[tid] for tid in available_trains), dtype=np.intp, count=len(available_trains))
+        scores = score_kernel(batch.base, batch.length_penalty, batch.passenger_factor, batch.energy_factor,
+                              idx, weather_delay, signal_penalty)
+
+        # Sort available trains by score ascending (lower score = higher priority); stable like sorted()
+        order = np.argsort(scores, kind="stable")
+        sorted_trains = [available_trains[i] for i in order]
+        sorted_scores = scores[order].tolist()
 
         # Decide which trains get to proceed given section capacity
         allowed_train_count = min(conflict.track_capacity, len(sorted_trains))
@@ -94,9 +124,11 @@ def ai_decision(
         for tid in trains_to_proceed:
             decisions[tid] = f"Proceed first on section {conflict.section_id}"
 
-        for tid in trains_to_hold:
+        # Scores were computed once above; the last proceeding train's is read by position
+        last_proceed_score = sorted_scores[allowed_train_count - 1] if trains_to_proceed else None
+        for tid, score in zip(trains_to_hold, sorted_scores[allowed_train_count:]):
             if trains_to_proceed:
-                delay_min = int(score_train(tid) - score_train(trains_to_proceed[-1])) + weather_delay_map.get(conflict.weather_condition, 0)
+                delay_min = int(score - last_proceed_score) + weather_delay
                 delay_min = max(delay_min, 5)  # minimum hold 5 minutes
             else:
                 delay_min = 10  # fallback hold if no trains proceed
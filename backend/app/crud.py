@@ -1,8 +1,15 @@
+from dataclasses import dataclass
+from sqlalchemy import case, func, insert
 from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from . import models, schemas
 from typing import List, Optional
 
+def row_dicts(rows, model) -> List[dict]:
+    # Mapped column values of ORM rows as plain dicts, for responses that skip Pydantic validation
+    columns = model.__table__.columns.keys()
+    return [{col: getattr(row, col) for col in columns} for row in rows]
+
 # Station CRUD (example)
 async def get_station(db: AsyncSession, station_id: str):
     result = await db.execute(select(models.Station).where(models.Station.station_id == station_id))
@@ -13,10 +20,9 @@ async def list_stations(db: AsyncSession, skip: int = 0, limit: int = 100) -> Li
     return result.scalars().all()
 
 async def create_station(db: AsyncSession, station: schemas.StationBase):
-    db_station = models.Station(**station.dict())
+    db_station = models.Station(**station.model_dump())
     db.add(db_station)
     await db.commit()
-    await db.refresh(db_station)
     return db_station
 
 # Train CRUD
@@ -24,17 +30,57 @@ async def get_train(db: AsyncSession, train_id: str):
     result = await db.execute(select(models.Train).where(models.Train.train_id == train_id))
     return result.scalars().first()
 
-async def list_trains(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[schemas.Train]:
-    result = await db.execute(select(models.Train).offset(skip).limit(limit))
+async def list_trains(db: AsyncSession, skip: int = 0, limit: int = 100,
+                      order_by_priority: bool = False) -> List[schemas.Train]:
+    query = select(models.Train)
+    if order_by_priority:
+        query = query.order_by(models.Train.priority_score)
+    result = await db.execute(query.offset(skip).limit(limit))
     return result.scalars().all()
 
+async def stream_trains(db: AsyncSession, batch_size: int = 1000):
+    # Server-side cursor, fetched batch_size rows at a time
+    result = await db.stream(select(models.Train).execution_options(yield_per=batch_size))
+    async for train in result.scalars():
+        yield train
+
 async def create_train(db: AsyncSession, train: schemas.TrainBase):
-    db_train = models.Train(**train.dict())
+    db_train = models.Train(**train.model_dump())
     db.add(db_train)
     await db.commit()
-    await db.refresh(db_train)
     return db_train
 
+@dataclass
+class KPIAggregates:
+    total_trains: int
+    delayed_trains: int
+    average_delay_minutes: float
+
+async def get_kpi_aggregates(db: AsyncSession) -> KPIAggregates:
+    # One aggregate query over all trains; a missing delay counts as 0
+    delay = func.coalesce(models.Train.delay_minutes, 0)
+    result = await db.execute(select(
+        func.count(),
+        func.sum(case((delay > 0, 1), else_=0)),
+        func.avg(delay)
+    ).select_from(models.Train))
+    total, delayed, avg_delay = result.one()
+    return KPIAggregates(total_trains=total, delayed_trains=delayed or 0, average_delay_minutes=avg_delay or 0.0)
+
+async def get_table_counts(db: AsyncSession) -> tuple:
+    # Row counts of trains, sections and train_sections in one round trip
+    result = await db.execute(select(
+        select(func.count()).select_from(models.Train).scalar_subquery(),
+        select(func.count()).select_from(models.Section).scalar_subquery(),
+        select(func.count()).select_from(models.TrainSection).scalar_subquery()
+    ))
+    return tuple(result.one())
+
+async def list_column_rows(db: AsyncSession, columns, limit: Optional[int] = None) -> List[tuple]:
+    # Rows of just the given table columns, read as plain tuples without building ORM instances
+    result = await db.execute(select(*columns).limit(limit))
+    return [tuple(row) for row in result]
+
 # Section CRUD (added)
 async def list_sections(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[schemas.Section]:
     result = await db.execute(select(models.Section).offset(skip).limit(limit))
@@ -53,10 +99,9 @@ async def list_train_sections(db: AsyncSession, train_id: Optional[str] = None):
     return result.scalars().all()
 
 async def create_train_section(db: AsyncSession, train_section: schemas.TrainSectionCreate):
-    db_ts = models.TrainSection(**train_section.dict())
+    db_ts = models.TrainSection(**train_section.model_dump())
     db.add(db_ts)
     await db.commit()
-    await db.refresh(db_ts)
     return db_ts
 
 # Disruptions CRUD (to support /disruptions/ endpoint)
@@ -65,20 +110,31 @@ async def list_disruptions(db: AsyncSession, skip: int = 0, limit: int = 100) ->
     return result.scalars().all()
 
 async def create_disruption(db: AsyncSession, disruption: schemas.DisruptionBase):
-    db_obj = models.Disruption(**disruption.dict())
+    db_obj = models.Disruption(**disruption.model_dump())
     db.add(db_obj)
     await db.commit()
-    await db.refresh(db_obj)
     return db_obj
 
 # Audit CRUD
 async def create_audit_decision(db: AsyncSession, decision: schemas.AuditDecisionBase) -> models.AuditDecision:
-    db_obj = models.AuditDecision(**decision.dict())
+    db_obj = models.AuditDecision(**decision.model_dump())
     db.add(db_obj)
     await db.commit()
-    await db.refresh(db_obj)
     return db_obj
 
+async def bulk_create_audit_decisions(db: AsyncSession, rows: List[dict]) -> int:
+    # Decisions queued by the audit route, written with one executemany INSERT and one commit
+    if rows:
+        await db.execute(insert(models.AuditDecision), rows)
+    await db.commit()
+    return len(rows)
+
+async def stream_audit_decisions(db: AsyncSession, batch_size: int = 1000):
+    # Server-side cursor, fetched batch_size rows at a time
+    result = await db.stream(select(models.AuditDecision).execution_options(yield_per=batch_size))
+    async for decision in result.scalars():
+        yield decision
+
 async def list_audit_decisions(db: AsyncSession, since: Optional[str] = None) -> List[models.AuditDecision]:
     # For simplicity, not filtering by since here (no datetime type). Could be added later.
     result = await db.execute(select(models.AuditDecision))
@@ -1,3 +1,4 @@
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 import os
@@ -8,17 +9,33 @@ SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./app.d
 
 # Configure engine; avoid pooling options for SQLite
 is_sqlite = SQLALCHEMY_DATABASE_URL.startswith("sqlite+")
+is_asyncpg = "+asyncpg" in SQLALCHEMY_DATABASE_URL
 
+# SQL logging is opt-in (SQL_ECHO=1); formatting every statement is costly on hot list endpoints
 engine = create_async_engine(
     SQLALCHEMY_DATABASE_URL,
-    echo=True,
+    echo=os.getenv("SQL_ECHO", "0") == "1",
     **({
         "pool_size": 20,
         "max_overflow": 10,
         "pool_pre_ping": True,
-    } if not is_sqlite else {})
+        # Keep more prepared statements per connection than asyncpg's default of 100
+        **({"connect_args": {"statement_cache_size": 500, "prepared_statement_cache_size": 500}}
+           if is_asyncpg else {}),
+    } if not is_sqlite else {
+        "connect_args": {"check_same_thread": False},
+    })
 )
 
+if is_sqlite:
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        # WAL lets readers proceed while a write is in progress
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
 SessionLocal = sessionmaker(
     bind=engine,
     class_=AsyncSession,
@@ -1,105 +1,104 @@
+import orjson
 import pandas as pd
 import asyncio
+from sqlalchemy import insert
 from .database import engine, SessionLocal
 from . import models
 from sqlalchemy.ext.asyncio import AsyncSession
 
+# Rows read, inserted and committed at a time, so memory stays bounded however large the file
+CHUNK_SIZE = 10_000
 
-async def import_stations():
-    df = pd.read_csv("data/stations.csv")  # Change path as needed
+
+async def _bulk_insert(model, path: str, dtype: dict, prepare=None):
+    # One executemany INSERT and one commit per chunk instead of an ORM add per row
     async with SessionLocal() as session:
-        for _, row in df.iterrows():
-            station = models.Station(
-                station_id=row.station_id,
-                display_name=row.display_name,
-                lat=row.lat,
-                lon=row.lon,
-                platforms=int(row.platforms),
-            )
-            session.add(station)
-        await session.commit()
+        for chunk in pd.read_csv(path, dtype=dtype, chunksize=CHUNK_SIZE):
+            if chunk.empty:
+                continue
+            if prepare is not None:
+                prepare(chunk)
+            await session.execute(insert(model), chunk.to_dict(orient="records"))
+            await session.commit()
+
+
+async def import_stations():
+    await _bulk_insert(
+        models.Station,
+        "data/stations.csv",  # Change path as needed
+        {"station_id": str, "display_name": str, "lat": "float64", "lon": "float64", "platforms": "int64"},
+    )
+
+
+def _prepare_sections(df: pd.DataFrame):
+    df["junction_flag"] = df["junction_flag"].str.lower().eq("yes")
 
 
 async def import_sections():
-    df = pd.read_csv("data/sections.csv")  # Change path as needed
-    async with SessionLocal() as session:
-        for _, row in df.iterrows():
-            section = models.Section(
-                section_id=row.section_id,
-                from_station=row.from_station,
-                to_station=row.to_station,
-                length_km=row.length_km,
-                track_type=row.track_type,
-                max_trains_allowed=row.max_trains_allowed,
-                block_length_km=row.block_length_km,
-                num_blocks=row.num_blocks,
-                junction_flag=row.junction_flag.lower() == "yes",
-            )
-            session.add(section)
-        await session.commit()
+    await _bulk_insert(
+        models.Section,
+        "data/sections.csv",  # Change path as needed
+        {
+            "section_id": str, "from_station": str, "to_station": str, "length_km": "float64",
+            "track_type": str, "max_trains_allowed": "int64", "block_length_km": "float64",
+            "num_blocks": "int64", "junction_flag": str,
+        },
+        _prepare_sections,
+    )
 
 
 async def import_disruptions():
-    df = pd.read_csv("data/disruptions.csv")  # Change path as needed
-    async with SessionLocal() as session:
-        for _, row in df.iterrows():
-            disruption = models.Disruption(
-                disruption_id=row.disruption_id,
-                type=row.type,
-                location_section=row.location_section,
-                start_time=row.start_time,
-                duration_minutes=row.duration_minutes,
-                severity=row.severity,
-            )
-            session.add(disruption)
-        await session.commit()
+    await _bulk_insert(
+        models.Disruption,
+        "data/disruptions.csv",  # Change path as needed
+        {
+            "disruption_id": str, "type": str, "location_section": str, "start_time": str,
+            "duration_minutes": "int64", "severity": str,
+        },
+    )
+
+
+def _prepare_trains(df: pd.DataFrame):
+    df["platform_requirement"] = df["platform_requirement"].eq("Yes")
+    df["route_nodes"] = df["route_nodes"].map(orjson.loads)
+    df["route_sections"] = df["route_sections"].map(orjson.loads)
+    # Core inserts skip the ORM before_insert hook, so the stored priority score is filled in here
+    score_fields = df[["train_type", "priority", "scheduled_start_time", "delay_minutes"]]
+    df["priority_score"] = [models.compute_priority_score(row._asdict())
+                            for row in score_fields.itertuples(index=False)]
 
 
 async def import_trains():
-    df = pd.read_csv("data/trains.csv")  # Change path as needed
-    async with SessionLocal() as session:
-        for _, row in df.iterrows():
-            train = models.Train(
-                train_id=row.train_id,
-                train_name=row.train_name,
-                train_type=row.train_type,
-                priority=row.priority,
-                max_speed_kmph=row.max_speed_kmph,
-                platform_requirement=row.platform_requirement == "Yes",
-                scheduled_start_time=row.scheduled_start_time,
-                origin_station=row.origin_station,
-                destination_station=row.destination_station,
-                route_nodes=eval(row.route_nodes),  # Assumes JSON-like strings
-                route_sections=eval(row.route_sections),
-                delay_minutes=row.delay_minutes,
-            )
-            session.add(train)
-        await session.commit()
+    await _bulk_insert(
+        models.Train,
+        "data/trains.csv",  # Change path as needed
+        {
+            "train_id": str, "train_name": str, "train_type": str, "priority": "int64",
+            "max_speed_kmph": "int64", "platform_requirement": str, "scheduled_start_time": str,
+            "origin_station": str, "destination_station": str, "route_nodes": str,
+            "route_sections": str, "delay_minutes": "int64",
+        },
+        _prepare_trains,
+    )
 
 
 async def import_train_sections():
-    df = pd.read_csv("data/train_sections.csv")  # Change path as needed
-    async with SessionLocal() as session:
-        for _, row in df.iterrows():
-            ts = models.TrainSection(
-                train_id=row.train_id,
-                section_id=row.section_id,
-                scheduled_entry_time=row.scheduled_entry_time,
-                scheduled_exit_time=row.scheduled_exit_time,
-                planned_stop_next_station=int(row.planned_stop_next_station),
-                dwell_minutes_next_station=int(row.dwell_minutes_next_station),
-            )
-            session.add(ts)
-        await session.commit()
+    await _bulk_insert(
+        models.TrainSection,
+        "data/train_sections.csv",  # Change path as needed
+        {
+            "train_id": str, "section_id": str, "scheduled_entry_time": str, "scheduled_exit_time": str,
+            "planned_stop_next_station": "int64", "dwell_minutes_next_station": "int64",
+        },
+    )
 
 
 async def main():
     async with engine.begin() as conn:
         await conn.run_sync(models.Base.metadata.create_all)
-    await import_stations()
-    await import_sections()
-    await import_disruptions()
-    await import_trains()
+    # Only train_sections references other tables (trains and sections), so the rest load
+    # concurrently, each in its own session
+    await asyncio.gather(import_stations(), import_sections(), import_disruptions(), import_trains())
     await import_train_sections()
 
 
@@ -1,9 +1,15 @@
+import time
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
-from . import models, schemas, crud, database, import_data
+from . import models, schemas, crud, database, import_data, worker_pool
+from .database import get_db
 from .routes import optimization
 from .routes import live_data_routes
 
@@ -11,7 +17,24 @@ from .routes import ai_routes
 from .routes import conflict_alerts_routes
 
 
-app = FastAPI(title="AlgoRail Backend API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create tables and open the first pooled connection before serving, so the first
+    # request doesn't pay for the connect/PRAGMA handshake
+    async with database.engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.create_all)
+        await conn.execute(text("SELECT 1"))
+    worker_pool.start_pool()
+    audit_flusher = ai_routes.start_audit_flusher()
+    yield
+    await ai_routes.stop_audit_flusher(audit_flusher)
+    worker_pool.shutdown_pool()
+    await database.engine.dispose()
+
+
+# orjson serializes the list endpoints (with their JSON route columns) much faster than stdlib json
+app = FastAPI(title="AlgoRail Backend API", default_response_class=ORJSONResponse,
+              lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -29,6 +52,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses such as the train/station lists
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 
 # Include existing routers inside a function to avoid circular imports
 def include_routes():
@@ -42,11 +68,6 @@ include_routes()
 app.include_router(live_data_routes.router)
 app.include_router(conflict_alerts_routes.router)
 
-async def get_db():
-    async with database.SessionLocal() as session:
-        yield session
-
-
 @app.get("/", tags=["Root"])
 async def read_root():
     return {"message": "AlgoRail Backend API is running"}
@@ -59,7 +80,7 @@ async def get_status():
 
 @app.get("/stations/", response_model=List[schemas.Station])
 async def read_stations(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
-    return await crud.list_stations(db)
+    return await crud.list_stations(db, skip=skip, limit=limit)
 
 
 @app.post("/stations/", response_model=schemas.Station)
@@ -69,7 +90,7 @@ async def create_station(station: schemas.StationBase, db: AsyncSession = Depend
 
 @app.get("/sections/", response_model=List[schemas.Section])
 async def read_sections(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
-    return await crud.list_sections(db)
+    return await crud.list_sections(db, skip=skip, limit=limit)
 
 
 @app.post("/sections/", response_model=schemas.Section)
@@ -79,7 +100,7 @@ async def create_section(section: schemas.SectionBase, db: AsyncSession = Depend
 
 @app.get("/disruptions/", response_model=List[schemas.Disruption])
 async def read_disruptions(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
-    return await crud.list_disruptions(db)
+    return await crud.list_disruptions(db, skip=skip, limit=limit)
 
 
 @app.post("/disruptions/", response_model=schemas.Disruption)
@@ -89,7 +110,21 @@ async def create_disruption(disruption: schemas.DisruptionBase, db: AsyncSession
 
 @app.get("/trains/", response_model=List[schemas.Train])
 async def read_trains(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
-    return await crud.list_trains(db)
+    # Rows are encoded straight from their columns; response_model only documents the shape
+    trains = await crud.list_trains(db, skip=skip, limit=limit)
+    return ORJSONResponse(crud.row_dicts(trains, models.Train))
+
+
+@app.get("/trains/export")
+async def export_trains():
+    """Stream every train as JSON lines without loading the table into memory"""
+    async def rows():
+        # Own session: the stream outlives the request handler
+        async with database.SessionLocal() as session:
+            async for train in crud.stream_trains(session):
+                yield schemas.Train.model_validate(train).model_dump_json() + "\n"
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
 
 
 @app.post("/trains/", response_model=schemas.Train)
@@ -107,7 +142,9 @@ async def create_train_section(train_section: schemas.TrainSectionCreate, db: As
 
 @app.get("/train_sections/", response_model=List[schemas.TrainSection])
 async def read_train_sections(train_id: Optional[str] = None, db: AsyncSession = Depends(get_db)):
-    return await crud.list_train_sections(db, train_id)
+    # Rows are encoded straight from their columns; response_model only documents the shape
+    train_sections = await crud.list_train_sections(db, train_id)
+    return ORJSONResponse(crud.row_dicts(train_sections, models.TrainSection))
 
 
 @app.post("/import-data/")
@@ -116,19 +153,28 @@ async def trigger_import():
     return {"message": "Data import complete."}
 
 
+# KPIs are recomputed at most once per TTL; dashboards poll this endpoint
+KPI_CACHE_TTL_SECONDS = 10.0
+_kpi_cache = {}
+
+
 @app.get("/kpis/current", response_model=schemas.KPIResponse)
 async def get_current_kpis(db: AsyncSession = Depends(get_db)):
-    trains = await crud.list_trains(db)
-    total = len(trains)
-    delayed = sum(1 for t in trains if (t.delay_minutes or 0) > 0)
-    avg_delay = (sum((t.delay_minutes or 0) for t in trains) / total) if total else 0.0
+    cached = _kpi_cache.get("kpi")
+    if cached and time.monotonic() - cached[0] < KPI_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    kpis = await crud.get_kpi_aggregates(db)
+    total = kpis.total_trains
     # Simple placeholders; can refine using schedule + sections
     throughput = float(total) / 2.0 if total else 0.0
     utilization = 65.0 if total else 0.0
-    return schemas.KPIResponse(
+    response = schemas.KPIResponse(
         total_trains=total,
-        delayed_trains=delayed,
-        average_delay_minutes=round(avg_delay, 2),
+        delayed_trains=kpis.delayed_trains,
+        average_delay_minutes=round(kpis.average_delay_minutes, 2),
         throughput_trains_per_hour=round(throughput, 2),
         section_utilization_pct=utilization,
     )
+    _kpi_cache["kpi"] = (time.monotonic(), response)
+    return response
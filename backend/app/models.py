@@ -1,6 +1,7 @@
-from sqlalchemy import Column, String, Integer, Float, Enum, Boolean, JSON, ForeignKey
+from sqlalchemy import Column, String, Integer, Float, Enum, Boolean, JSON, ForeignKey, event
 from sqlalchemy.orm import relationship
 from .database import Base
+from algorithms.priority_engine import PriorityEngine
 import enum
 
 class TrainStatusEnum(enum.Enum):
@@ -55,10 +56,28 @@ class Train(Base):
     route_nodes = Column(JSON)
     route_sections = Column(JSON)
     delay_minutes = Column(Integer)
+    # PriorityEngine score, stored at write time so readers can sort/filter on it in SQL
+    priority_score = Column(Float, index=True)
 
     # Added relationship to TrainSection model
     train_sections = relationship("TrainSection", back_populates="train")
 
+_priority_engine = PriorityEngine()
+
+def compute_priority_score(train_fields: dict) -> float:
+    """PriorityEngine score from a train's column values; NULL columns fall back to the engine defaults"""
+    return _priority_engine.get_train_priority({k: v for k, v in train_fields.items() if v is not None})
+
+@event.listens_for(Train, "before_insert")
+@event.listens_for(Train, "before_update")
+def _set_priority_score(mapper, connection, target):
+    target.priority_score = compute_priority_score({
+        'train_type': target.train_type,
+        'priority': target.priority,
+        'scheduled_start_time': target.scheduled_start_time,
+        'delay_minutes': target.delay_minutes,
+    })
+
 class TrainSection(Base):
     __tablename__ = "train_sections"
 
@@ -1,12 +1,89 @@
-from fastapi import APIRouter, Depends
+import asyncio
+import logging
+import orjson
+from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict
+from typing import List, Dict, Optional
 from backend.app.ai_decision_engine import Train, SectionConflict, ai_decision
-from sqlalchemy.ext.asyncio import AsyncSession
-from ..database import get_db
-from .. import crud, schemas
+from ..database import SessionLocal
+from ..worker_pool import get_pool
+from .. import crud, models, schemas
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# orjson responses regardless of the app the router is mounted on
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Audit decisions are queued by the POST route and written by flush_audit_decisions in batches
+# of up to AUDIT_FLUSH_MAX_ROWS, collected for at most AUDIT_FLUSH_INTERVAL_SECONDS, so requests
+# don't each pay for an INSERT and commit
+AUDIT_FLUSH_MAX_ROWS = 500
+AUDIT_FLUSH_INTERVAL_SECONDS = 0.05
+# A batch whose insert fails is retried, waiting AUDIT_RETRY_DELAY_SECONDS and doubling each time
+AUDIT_WRITE_ATTEMPTS = 3
+AUDIT_RETRY_DELAY_SECONDS = 0.5
+# Created by start_audit_flusher in the app lifespan, so it belongs to the loop serving requests
+_audit_queue: Optional[asyncio.Queue] = None
+_AUDIT_ACK = schemas.AuditDecisionAck(queued=True)
+
+# Columns of a stored decision, which are exactly the AuditDecision response fields
+_AUDIT_COLUMNS = models.AuditDecision.__table__.columns.keys()
+
+
+async def write_audit_batch(rows) -> bool:
+    """Insert a batch of acknowledged decisions, retrying failed attempts. A batch that still can't be
+    written is logged in full, so the decisions can be recovered from the log"""
+    for attempt in range(1, AUDIT_WRITE_ATTEMPTS + 1):
+        try:
+            async with SessionLocal() as session:
+                await crud.bulk_create_audit_decisions(session, rows)
+            return True
+        except Exception:
+            if attempt == AUDIT_WRITE_ATTEMPTS:
+                logger.exception("Dropping %d audit decisions after %d failed writes: %r",
+                                 len(rows), attempt, rows)
+                return False
+            logger.warning("Writing %d audit decisions failed (attempt %d of %d), retrying",
+                           len(rows), attempt, AUDIT_WRITE_ATTEMPTS, exc_info=True)
+            await asyncio.sleep(AUDIT_RETRY_DELAY_SECONDS * 2 ** (attempt - 1))
+
+
+def start_audit_flusher() -> asyncio.Task:
+    """Create the audit queue on the running loop and start the task that drains it"""
+    global _audit_queue
+    _audit_queue = asyncio.Queue()
+    return asyncio.create_task(flush_audit_decisions(_audit_queue))
+
+
+async def flush_audit_decisions(queue: asyncio.Queue):
+    """Background task started with the app: drain queued audit decisions into batched inserts"""
+    loop = asyncio.get_running_loop()
+    stopping = False
+    while not stopping:
+        row = await queue.get()
+        rows = []
+        deadline = loop.time() + AUDIT_FLUSH_INTERVAL_SECONDS
+        # None is the shutdown sentinel from stop_audit_flusher
+        while row is not None:
+            rows.append(row)
+            if len(rows) >= AUDIT_FLUSH_MAX_ROWS:
+                break
+            try:
+                row = await asyncio.wait_for(queue.get(), deadline - loop.time())
+            except asyncio.TimeoutError:
+                break
+        stopping = row is None
+        if rows:
+            await write_audit_batch(rows)
+
+
+async def stop_audit_flusher(flusher):
+    """Let the flusher write everything queued so far, then wait for it to finish"""
+    global _audit_queue
+    queue, _audit_queue = _audit_queue, None
+    await queue.put(None)
+    await flusher
 
 class TrainModel(BaseModel):
     train_id: str
@@ -31,40 +108,37 @@ class AiDecisionRequest(BaseModel):
 
 @router.post("/ai_decision/")
 async def get_ai_recommendation(request: AiDecisionRequest):
-    trains = {
-        t.train_id: Train(
-            t.train_id,
-            t.priority,
-            t.train_type,
-            t.length,
-            t.delay,
-            t.passenger_load,
-            t.energy_efficiency,
-        )
-        for t in request.trains
-    }
-    conflicts = [
-        SectionConflict(
-            c.section_id,
-            c.competing_trains,
-            c.signal_state,
-            c.weather_condition,
-            c.platform_availability,
-            c.track_capacity,
-        )
-        for c in request.conflicts
-    ]
-
-    recommendations = ai_decision(trains, conflicts)
+    # One model_dump for the whole request; its dicts map straight onto the engine's dataclasses
+    dumped = request.model_dump()
+    trains = {t['train_id']: Train(**t) for t in dumped['trains']}
+    conflicts = [SectionConflict(**c) for c in dumped['conflicts']]
+
+    # ai_decision is synchronous CPU work; it runs in the shared worker pool so the event loop keeps
+    # serving other requests
+    recommendations = await asyncio.get_running_loop().run_in_executor(get_pool(), ai_decision, trains, conflicts)
     return {"recommendations": recommendations}
 
 
-@router.post("/audit/decision", response_model=schemas.AuditDecision)
-async def record_decision(decision: schemas.AuditDecisionBase, db: AsyncSession = Depends(get_db)):
-    created = await crud.create_audit_decision(db, decision)
-    return created
+@router.post("/audit/decision", response_model=schemas.AuditDecisionAck, status_code=202)
+async def record_decision(decision: schemas.AuditDecisionBase):
+    if _audit_queue is None:
+        # No flusher running (app used without its lifespan): write the decision straight away
+        await write_audit_batch([decision.model_dump()])
+    else:
+        await _audit_queue.put(decision.model_dump())
+    return _AUDIT_ACK
 
 @router.get("/audit/decision", response_model=list[schemas.AuditDecision])
-async def list_decisions(db: AsyncSession = Depends(get_db)):
-    items = await crud.list_audit_decisions(db)
-    return items
+async def list_decisions():
+    """Stream the audit log as a JSON array without loading the table into memory"""
+    async def rows():
+        # Own session: the stream outlives the request handler. Stored rows were validated on the
+        # way in, so each is encoded straight from its columns without building a Pydantic model
+        async with SessionLocal() as session:
+            separator = b"["
+            async for decision in crud.stream_audit_decisions(session):
+                yield separator + orjson.dumps({col: getattr(decision, col) for col in _AUDIT_COLUMNS})
+                separator = b","
+            yield b"]" if separator == b"," else b"[]"
+
+    return StreamingResponse(rows(), media_type="application/json")
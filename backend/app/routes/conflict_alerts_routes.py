@@ -1,4 +1,5 @@
-from fastapi import APIRouter
+import orjson
+from fastapi import APIRouter, Response
 from pydantic import BaseModel
 from typing import List
 
@@ -13,25 +14,30 @@ class ConflictAlert(BaseModel):
     severity_level: int  # 1=Low, 5=High
     timestamp: str  # ISO format datetime string
 
-# Static dummy conflict alerts
+# Static dummy conflict alerts, built once at import rather than per request
+_ALERTS = [
+    ConflictAlert(
+        alert_id="A001",
+        section_id="S03",
+        conflicting_trains=["T001", "T005"],
+        alert_type="Track Block",
+        severity_level=4,
+        timestamp="2025-09-12T12:30:00Z"
+    ),
+    ConflictAlert(
+        alert_id="A002",
+        section_id="S07",
+        conflicting_trains=["T002", "T008"],
+        alert_type="Signal Failure",
+        severity_level=5,
+        timestamp="2025-09-12T12:32:00Z"
+    )
+]
+
+# Serialized once too; returning a Response skips per-request validation and encoding,
+# while response_model still documents the payload
+_ALERTS_JSON = orjson.dumps([item.model_dump() for item in _ALERTS])
+
 @router.get("/conflict-alerts/", response_model=List[ConflictAlert])
 async def get_conflict_alerts():
-    alerts = [
-        {
-            "alert_id": "A001",
-            "section_id": "S03",
-            "conflicting_trains": ["T001", "T005"],
-            "alert_type": "Track Block",
-            "severity_level": 4,
-            "timestamp": "2025-09-12T12:30:00Z"
-        },
-        {
-            "alert_id": "A002",
-            "section_id": "S07",
-            "conflicting_trains": ["T002", "T008"],
-            "alert_type": "Signal Failure",
-            "severity_level": 5,
-            "timestamp": "2025-09-12T12:32:00Z"
-        }
-    ]
-    return alerts
+    return Response(content=_ALERTS_JSON, media_type="application/json")
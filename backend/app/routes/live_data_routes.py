@@ -1,4 +1,5 @@
-from fastapi import APIRouter
+import orjson
+from fastapi import APIRouter, Response
 from pydantic import BaseModel
 from typing import List
 
@@ -12,32 +13,36 @@ class LiveTrain(BaseModel):
     speed_kmph: float
     delay_minutes: int
 
+# Static dummy data simulating live train positions, built once at import rather than per request
+_LIVE_TRAINS = [
+    LiveTrain(
+        train_id="T001",
+        current_section="S03",
+        position_km=12.5,
+        speed_kmph=75.0,
+        delay_minutes=0
+    ),
+    LiveTrain(
+        train_id="T002",
+        current_section="S05",
+        position_km=30.1,
+        speed_kmph=60.0,
+        delay_minutes=5
+    ),
+    LiveTrain(
+        train_id="T003",
+        current_section="S01",
+        position_km=0.0,
+        speed_kmph=0.0,
+        delay_minutes=15
+    )
+]
+
+# Serialized once too; returning a Response skips per-request validation and encoding,
+# while response_model still documents the payload
+_LIVE_TRAINS_JSON = orjson.dumps([item.model_dump() for item in _LIVE_TRAINS])
+
 # API endpoint returning static dummy live train positions
 @router.get("/live-trains/", response_model=List[LiveTrain])
 async def get_live_trains():
-    # Static dummy data simulating live train positions
-    trains = [
-        {
-            "train_id": "T001",
-            "current_section": "S03",
-            "position_km": 12.5,
-            "speed_kmph": 75.0,
-            "delay_minutes": 0
-        },
-        {
-            "train_id": "T002",
-            "current_section": "S05",
-            "position_km": 30.1,
-            "speed_kmph": 60.0,
-            "delay_minutes": 5
-        },
-        {
-            "train_id": "T003",
-            "current_section": "S01",
-            "position_km": 0.0,
-            "speed_kmph": 0.0,
-            "delay_minutes": 15
-        }
-    ]
-    return trains
-
+    return Response(content=_LIVE_TRAINS_JSON, media_type="application/json")
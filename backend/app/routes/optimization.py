@@ -1,8 +1,15 @@
-from ..database import get_db
-from fastapi import APIRouter, Query, Depends, HTTPException
+import asyncio
+import hashlib
+import time
+import orjson
+from collections import OrderedDict
+from ..database import get_db, SessionLocal
+from ..worker_pool import get_pool
+from fastapi import APIRouter, Query, Depends, HTTPException, Response
 from typing import Literal, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from ..crud import list_trains, list_train_sections, list_sections
+from ..crud import list_column_rows, get_table_counts
+from .. import models
 import pandas as pd
 
 from algorithms.milp_optimizer import MILPOptimizer
@@ -13,23 +20,102 @@ from backend.app.routes.schedule_postprocess import convert_train_order_to_sched
 router = APIRouter()
 OptimizationResult = Dict[str, Any]
 
-async def milp_optimizer(db: AsyncSession) -> OptimizationResult:
-    trains = await list_trains(db)
-    sections = await list_sections(db)
-    train_sections = await list_train_sections(db)
+# Frames from the last load, reused while the table row counts are unchanged and for at most
+# FRAMES_CACHE_TTL_SECONDS. Inserts change a count and force a reload at once; updates, or deletes
+# balanced by inserts (e.g. made outside the API), are picked up when the TTL runs out
+FRAMES_CACHE_TTL_SECONDS = 30
+_frames_cache: Dict[str, Any] = {}
+
+# JSON route lists no solver reads; leaving them out keeps the frames all scalar columns, which
+# are far cheaper to fetch, fingerprint and pickle into the worker processes
+_SOLVER_UNUSED_COLUMNS = {"route_nodes", "route_sections"}
+
+async def _fetch_frame(model, limit=None) -> pd.DataFrame:
+    """The solver columns of a table as a DataFrame, selected as plain rows rather than ORM objects"""
+    columns = [col for col in model.__table__.columns if col.key not in _SOLVER_UNUSED_COLUMNS]
+    # An AsyncSession runs one statement at a time, so each concurrent fetch gets its own
+    async with SessionLocal() as session:
+        rows = await list_column_rows(session, columns, limit)
+    return pd.DataFrame.from_records(rows, columns=[col.key for col in columns])
+
+async def _load_frames(db: AsyncSession):
+    """trains, sections and train_sections frames, re-read when a row count changed or the TTL ran out.
+    Callers must not modify the returned frames in place."""
+    key = await get_table_counts(db)
+    expired = time.monotonic() - _frames_cache.get("loaded_at", float("-inf")) >= FRAMES_CACHE_TTL_SECONDS
+    if expired or _frames_cache.get("key") != key:
+        # Trains and sections are capped at 100 rows, the default page of list_trains/list_sections
+        _frames_cache["frames"] = tuple(await asyncio.gather(
+            _fetch_frame(models.Train, limit=100),
+            _fetch_frame(models.Section, limit=100),
+            _fetch_frame(models.TrainSection),
+        ))
+        _frames_cache["key"] = key
+        _frames_cache["loaded_at"] = time.monotonic()
+    return _frames_cache["frames"]
+
+# Solver results by input fingerprint, least recently used first. Entries expire after the TTL
+# so the randomized optimizers are re-run now and then rather than pinned to one result forever
+RESULT_CACHE_SIZE = 64
+RESULT_CACHE_TTL_SECONDS = 300
+_result_cache: "OrderedDict[bytes, tuple]" = OrderedDict()
+
+def _frames_fingerprint(method: str, *frames: pd.DataFrame) -> bytes:
+    """Digest of the method name and the frames' columns and values"""
+    digest = hashlib.blake2b(method.encode())
+    for df in frames:
+        digest.update(",".join(map(str, df.columns)).encode())
+        # Object columns can hold lists (from scenario overrides), which pandas can't hash, so their text is used
+        hashable = pd.DataFrame({col: df[col].astype(str) if df[col].dtype == object else df[col]
+                                 for col in df.columns})
+        digest.update(pd.util.hash_pandas_object(hashable, index=False).to_numpy().tobytes())
+    return digest.digest()
+
+# Solves currently running, by input fingerprint. Requests for inputs that are already being
+# solved wait on the same future instead of starting another solve
+_in_flight: Dict[bytes, asyncio.Future] = {}
+
+def _solve_milp(trains_df, sections_df, train_sections_df):
+    return MILPOptimizer().optimize(trains_df, sections_df, train_sections_df)
+
+def _solve_comprehensive_hybrid(trains_df, sections_df, train_sections_df):
+    return ComprehensiveHybridOptimizer().optimize(trains_df, sections_df, train_sections_df)
+
+async def _cached_solve(method: str, frames, solve):
+    """solve(*frames) in a worker process, reused from the cache when the same inputs were solved
+    recently or shared with a solve already running for them. solve must be a module-level
+    function so it can be pickled. Exceptions are not cached."""
+    key = _frames_fingerprint(method, *frames)
+    hit = _result_cache.get(key)
+    if hit is not None and time.monotonic() - hit[0] < RESULT_CACHE_TTL_SECONDS:
+        _result_cache.move_to_end(key)
+        return hit[1]
+
+    future = _in_flight.get(key)
+    if future is None:
+        # The solvers are synchronous CPU work (seconds to minutes); they run in the shared worker
+        # pool so the event loop keeps serving other requests
+        future = asyncio.get_running_loop().run_in_executor(get_pool(), solve, *frames)
+        _in_flight[key] = future
+        future.add_done_callback(lambda _: _in_flight.pop(key, None))
+    # Shielded so one caller disconnecting doesn't cancel the solve the others are waiting on
+    result = await asyncio.shield(future)
+    _result_cache[key] = (time.monotonic(), result)
+    _result_cache.move_to_end(key)
+    while len(_result_cache) > RESULT_CACHE_SIZE:
+        _result_cache.popitem(last=False)
+    return result
 
-    trains_df = pd.DataFrame([t.__dict__ for t in trains])
-    sections_df = pd.DataFrame([s.__dict__ for s in sections])
-    train_sections_df = pd.DataFrame([ts.__dict__ for ts in train_sections])
+async def milp_optimizer(db: AsyncSession) -> OptimizationResult:
+    trains_df, sections_df, train_sections_df = await _load_frames(db)
 
     try:
-        optimizer = MILPOptimizer()
-        schedule = optimizer.optimize(trains_df, sections_df, train_sections_df)
+        schedule = await _cached_solve("milp", (trains_df, sections_df, train_sections_df), _solve_milp)
         return {
             "method": "MILP",
             "optimized_schedule": schedule if schedule else "No optimal solution found",
-            "trains_count": len(trains),
-            "sections_count": len(train_sections),
+            "trains_count": len(trains_df),
+            "sections_count": len(train_sections_df),
         }
     except Exception as exc:
         # Graceful fallback if solver binary is unavailable in this environment
@@ -37,21 +123,15 @@ async def milp_optimizer(db: AsyncSession) -> OptimizationResult:
             "method": "MILP",
             "optimized_schedule": "Unavailable (solver not installed)",
             "error": str(exc),
-            "trains_count": len(trains),
-            "sections_count": len(train_sections),
+            "trains_count": len(trains_df),
+            "sections_count": len(train_sections_df),
         }
 
 
 async def rl_optimizer(db: AsyncSession) -> OptimizationResult:
-    trains = await list_trains(db)
-    sections = await list_sections(db)
-    train_sections = await list_train_sections(db)
-
-    trains_df = pd.DataFrame([t.__dict__ for t in trains])
-    sections_df = pd.DataFrame([s.__dict__ for s in sections])
-    train_sections_df = pd.DataFrame([ts.__dict__ for ts in train_sections])
+    trains_df, sections_df, train_sections_df = await _load_frames(db)
 
-    train_order, score = run_rl_optimizer(trains_df, sections_df, train_sections_df)
+    train_order, score = await _cached_solve("rl", (trains_df, sections_df, train_sections_df), run_rl_optimizer)
 
     schedule = convert_train_order_to_schedule(train_order, train_sections_df, sections_df)
 
@@ -59,21 +139,15 @@ async def rl_optimizer(db: AsyncSession) -> OptimizationResult:
         "method": "Reinforcement Learning",
         "optimized_schedule": schedule,
         "score": score,
-        "trains_count": len(trains),
-        "sections_count": len(train_sections),
+        "trains_count": len(trains_df),
+        "sections_count": len(train_sections_df),
     }
 
 async def comprehensive_hybrid_optimizer(db: AsyncSession) -> OptimizationResult:
-    trains = await list_trains(db)
-    sections = await list_sections(db)
-    train_sections = await list_train_sections(db)
-
-    trains_df = pd.DataFrame([t.__dict__ for t in trains])
-    sections_df = pd.DataFrame([s.__dict__ for s in sections])
-    train_sections_df = pd.DataFrame([ts.__dict__ for ts in train_sections])
+    trains_df, sections_df, train_sections_df = await _load_frames(db)
 
-    optimizer = ComprehensiveHybridOptimizer()
-    result = optimizer.optimize(trains_df, sections_df, train_sections_df)
+    result = await _cached_solve("comprehensive_hybrid", (trains_df, sections_df, train_sections_df),
+                                 _solve_comprehensive_hybrid)
 
     return {
         "method": result.method,
@@ -83,8 +157,8 @@ async def comprehensive_hybrid_optimizer(db: AsyncSession) -> OptimizationResult
         "throughput": result.throughput,
         "conflicts_resolved": result.conflicts_resolved,
         "success": result.success,
-        "trains_count": len(trains),
-        "sections_count": len(train_sections),
+        "trains_count": len(trains_df),
+        "sections_count": len(train_sections_df),
     }
 
 @router.get("/optimize/")
@@ -104,59 +178,90 @@ async def optimize_schedule(
 
     return {"status": "success", "data": result}
 
+# The quick, test and status endpoints answer with constants, so their bodies are encoded once at
+# import and may be cached by clients for a minute
+_CONSTANT_HEADERS = {"Cache-Control": "public, max-age=60"}
+
+_QUICK_JSON = orjson.dumps({
+    "status": "success",
+    "data": {
+        "method": "Test Mode",
+        "optimized_schedule": "Mock schedule for testing",
+        "total_delay": 95.0,
+        "computation_time": 0.02,
+        "throughput": 22,
+        "conflicts_resolved": 3,
+        "success": True,
+    },
+    "note": "Quick mock response (no solver)",
+})
+
+_TEST_JSON = orjson.dumps({
+    "status": "success", 
+    "data": {
+        "method": "Test Mode",
+        "optimized_schedule": "Mock schedule for testing",
+        "total_delay": 150.5,
+        "computation_time": 0.1,
+        "throughput": 25,
+        "conflicts_resolved": 3,
+        "success": True,
+        "trains_count": 25,
+        "sections_count": 11,
+        "note": "This is mock data for fast testing - not real optimization"
+    }
+})
+
+_STATUS_JSON = orjson.dumps({
+    "status": "available",
+    "methods": {
+        "milp": "Fast (0.3 seconds)",
+        "rl": "Medium (5-10 seconds)", 
+        "comprehensive_hybrid": "Very Slow (10+ minutes) - Not recommended for testing"
+    },
+    "recommended_for_testing": ["milp", "test"]
+})
+
 @router.get("/optimize/quick/")
-async def quick_optimize_schedule(
-    db: AsyncSession = Depends(get_db),
-):
+async def quick_optimize_schedule():
     """Ultra-fast endpoint that always returns a lightweight mock response (no solver)."""
-    return {
-        "status": "success",
-        "data": {
-            "method": "Test Mode",
-            "optimized_schedule": "Mock schedule for testing",
-            "total_delay": 95.0,
-            "computation_time": 0.02,
-            "throughput": 22,
-            "conflicts_resolved": 3,
-            "success": True,
-        },
-        "note": "Quick mock response (no solver)",
-    }
+    return Response(content=_QUICK_JSON, media_type="application/json", headers=_CONSTANT_HEADERS)
 
 @router.get("/optimize/test/")
-async def test_optimize_schedule(
-    db: AsyncSession = Depends(get_db),
-):
+async def test_optimize_schedule():
     """Ultra-fast testing endpoint - returns mock data"""
-    return {
-        "status": "success", 
-        "data": {
-            "method": "Test Mode",
-            "optimized_schedule": "Mock schedule for testing",
-            "total_delay": 150.5,
-            "computation_time": 0.1,
-            "throughput": 25,
-            "conflicts_resolved": 3,
-            "success": True,
-            "trains_count": 25,
-            "sections_count": 11,
-            "note": "This is mock data for fast testing - not real optimization"
-        }
-    }
+    return Response(content=_TEST_JSON, media_type="application/json", headers=_CONSTANT_HEADERS)
 
 @router.get("/optimize/status/")
 async def optimization_status():
     """Check optimization status without running it"""
-    return {
-        "status": "available",
-        "methods": {
-            "milp": "Fast (0.3 seconds)",
-            "rl": "Medium (5-10 seconds)", 
-            "comprehensive_hybrid": "Very Slow (10+ minutes) - Not recommended for testing"
-        },
-        "recommended_for_testing": ["milp", "test"]
-    }
+    return Response(content=_STATUS_JSON, media_type="application/json", headers=_CONSTANT_HEADERS)
+
+
+@router.post("/optimize/cache/clear")
+async def clear_optimization_cache():
+    """Drop every cached solver result"""
+    cleared = len(_result_cache)
+    _result_cache.clear()
+    return {"status": "success", "cleared": cleared}
+
 
+def _apply_overrides(df: pd.DataFrame, overrides: list, key: str):
+    """Patch df in place from override dicts keyed on `key`; the last override of a cell wins"""
+    # Collected per column first, so each column is assigned once with a single mask
+    updates: Dict[str, Dict[Any, Any]] = {}
+    for ov in overrides:
+        if not isinstance(ov, dict) or key not in ov:
+            continue
+        for col, val in ov.items():
+            if col != key and col in df.columns:
+                updates.setdefault(col, {})[ov[key]] = val
+
+    keys = df[key]
+    for col, values in updates.items():
+        mask = keys.isin(list(values))
+        if mask.any():
+            df.loc[mask, col] = keys[mask].map(values)
 
 @router.post("/optimize/scenario")
 async def optimize_scenario(payload: Dict[str, Any], db: AsyncSession = Depends(get_db)):
@@ -165,45 +270,27 @@ async def optimize_scenario(payload: Dict[str, Any], db: AsyncSession = Depends(
     (e.g., modified delays, capacity) and runs MILP as a fast proxy.
     The database is not mutated; we copy and patch in-memory dataframes.
     """
-    # Load base data
-    trains = await list_trains(db)
-    sections = await list_sections(db)
-    train_sections = await list_train_sections(db)
-
-    trains_df = pd.DataFrame([t.__dict__ for t in trains])
-    sections_df = pd.DataFrame([s.__dict__ for s in sections])
-    train_sections_df = pd.DataFrame([ts.__dict__ for ts in train_sections])
+    # Load base data; a shared frame is copied only when there are overrides to patch into it,
+    # so a preview without overrides allocates nothing
+    trains_df, sections_df, train_sections_df = await _load_frames(db)
 
     # Apply overrides if provided
     overrides = payload or {}
-    if "trains" in overrides and isinstance(overrides["trains"], list):
-        for ov in overrides["trains"]:
-            if not isinstance(ov, dict) or "train_id" not in ov:
-                continue
-            tid = ov["train_id"]
-            for col, val in ov.items():
-                if col == "train_id":
-                    continue
-                if col in trains_df.columns:
-                    trains_df.loc[trains_df["train_id"] == tid, col] = val
-
-    if "sections" in overrides and isinstance(overrides["sections"], list):
-        for ov in overrides["sections"]:
-            if not isinstance(ov, dict) or "section_id" not in ov:
-                continue
-            sid = ov["section_id"]
-            for col, val in ov.items():
-                if col == "section_id":
-                    continue
-                if col in sections_df.columns:
-                    sections_df.loc[sections_df["section_id"] == sid, col] = val
-
-    optimizer = MILPOptimizer()
-    schedule = optimizer.optimize(trains_df, sections_df, train_sections_df)
-
-    # Simple KPIs for scenario
-    avg_delay = float(trains_df["delay_minutes"].mean()) if not trains_df.empty else 0.0
-    throughput = len(schedule) if isinstance(schedule, list) else 0
+    if isinstance(overrides.get("trains"), list) and overrides["trains"]:
+        trains_df = trains_df.copy()
+        _apply_overrides(trains_df, overrides["trains"], "train_id")
+
+    if isinstance(overrides.get("sections"), list) and overrides["sections"]:
+        sections_df = sections_df.copy()
+        _apply_overrides(sections_df, overrides["sections"], "section_id")
+
+    # Keyed on the patched frames, so a scenario without effective overrides shares the plain MILP entry
+    schedule = await _cached_solve("milp", (trains_df, sections_df, train_sections_df), _solve_milp)
+
+    # Simple KPIs for scenario. The MILP schedule maps train_id to its visits (None if unsolved),
+    # so throughput is the number of trains scheduled. The pandas mean skips missing delays
+    avg_delay = float(trains_df["delay_minutes"].mean()) if len(trains_df) else 0.0
+    throughput = len(schedule) if schedule else 0
 
     return {
         "status": "success",
@@ -1,31 +1,33 @@
+import pandas as pd
+
+
 def convert_train_order_to_schedule(train_order, train_sections_df, sections_df, default_section_time=10):
     """
     Convert a list of train IDs (train_order) into detailed schedule dict:
     {train_id: [{section_id, start_time}, ...], ...}
     """
-    schedule = {}
-    grouped = train_sections_df.groupby('train_id')
-
-    for train_id in train_order:
-        if train_id not in grouped.groups:
-            continue
-        train_sections = train_sections_df.loc[grouped.groups[train_id]]
-        train_sections = train_sections.sort_values('scheduled_entry_time')
-        section_list = train_sections['section_id'].tolist()
+    # Visits of the ordered trains only, each train's in entry-time order: one sort of the frame
+    visits = (train_sections_df[train_sections_df['train_id'].isin(train_order)]
+              .sort_values(['train_id', 'scheduled_entry_time'], kind='stable'))
+    if visits.empty:
+        return {}
+    section_len = {}
+    if 'length_km' in sections_df.columns:
+        # First row wins for a repeated section_id, as with the previous per-section lookup
+        unique_sections = sections_df.drop_duplicates('section_id')
+        section_len = dict(zip(unique_sections['section_id'], unique_sections['length_km']))
 
-        start_time = 0
-        schedule[train_id] = []
-        for section_id in section_list:
-            if 'length_km' in sections_df.columns:
-                section_length = sections_df.loc[sections_df['section_id'] == section_id, 'length_km'].values
-                time_to_travel = section_length[0] if len(section_length) > 0 else default_section_time
-            else:
-                time_to_travel = default_section_time
+    # Each section starts when the train's previous ones have been travelled: an exclusive prefix
+    # sum per train, computed for every visit at once instead of an array per train
+    train_ids = visits['train_id']
+    section_ids = visits['section_id'].tolist()
+    time_to_travel = pd.Series([section_len.get(section_id, default_section_time) for section_id in section_ids],
+                               index=visits.index)
+    start_times = (time_to_travel.groupby(train_ids, sort=False).shift(fill_value=0)
+                   .groupby(train_ids, sort=False).cumsum())
 
-            schedule[train_id].append({
-                "section_id": section_id,
-                "start_time": start_time
-            })
-            start_time += time_to_travel
+    steps_by_train = {}
+    for train_id, section_id, start_time in zip(train_ids.tolist(), section_ids, start_times.tolist()):
+        steps_by_train.setdefault(train_id, []).append({"section_id": section_id, "start_time": start_time})
 
-    return schedule
+    return {train_id: steps_by_train[train_id] for train_id in train_order if train_id in steps_by_train}
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from backend.app import crud, schemas, models
@@ -9,8 +10,9 @@ router = APIRouter(prefix="/trains", tags=["trains"])
 # Get all trains
 @router.get("/", response_model=List[schemas.Train])
 async def read_trains(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
+    # Rows are encoded straight from their columns; response_model only documents the shape
     trains = await crud.list_trains(db, skip=skip, limit=limit)
-    return trains
+    return ORJSONResponse(crud.row_dicts(trains, models.Train))
 
 # Get a single train by ID
 @router.get("/{train_id}", response_model=schemas.Train)
@@ -30,7 +32,7 @@ async def create_train(train: schemas.TrainBase, db: AsyncSession = Depends(get_
 @router.get("/sections/", response_model=List[schemas.TrainSection])
 async def read_train_sections(train_id: Optional[str] = None, db: AsyncSession = Depends(get_db)):
     sections = await crud.list_train_sections(db, train_id)
-    return sections
+    return ORJSONResponse(crud.row_dicts(sections, models.TrainSection))
 
 # Create a new train section
 @router.post("/sections/", response_model=schemas.TrainSection)
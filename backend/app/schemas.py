@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, List
 from enum import Enum
 
@@ -15,8 +15,7 @@ class StationBase(BaseModel):
     platforms: Optional[int] = 1
 
 class Station(StationBase):
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class SectionBase(BaseModel):
     section_id: str
@@ -30,8 +29,7 @@ class SectionBase(BaseModel):
     junction_flag: Optional[bool]
 
 class Section(SectionBase):
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class DisruptionBase(BaseModel):
     disruption_id: str
@@ -42,8 +40,7 @@ class DisruptionBase(BaseModel):
     severity: str
 
 class Disruption(DisruptionBase):
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class TrainBase(BaseModel):
     train_id: str
@@ -60,8 +57,9 @@ class TrainBase(BaseModel):
     delay_minutes: int
 
 class Train(TrainBase):
-    class Config:
-        orm_mode = True
+    priority_score: Optional[float] = None
+
+    model_config = ConfigDict(from_attributes=True)
 
 
 class TrainSectionBase(BaseModel):
@@ -78,8 +76,7 @@ class TrainSectionCreate(TrainSectionBase):
 class TrainSection(TrainSectionBase):
     id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class AuditDecisionBase(BaseModel):
@@ -93,8 +90,13 @@ class AuditDecisionBase(BaseModel):
 class AuditDecision(AuditDecisionBase):
     id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+class AuditDecisionAck(BaseModel):
+    queued: bool
+
+    # Responses are shared instances (the route's constant ack, the KPI cache), so they are immutable
+    model_config = ConfigDict(frozen=True)
 
 
 class KPIResponse(BaseModel):
@@ -103,3 +105,5 @@ class KPIResponse(BaseModel):
     average_delay_minutes: float
     throughput_trains_per_hour: float
     section_utilization_pct: float
+
+    model_config = ConfigDict(frozen=True)
@@ -0,0 +1,30 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+
+# One process pool for all synchronous CPU work of the routes (solvers, AI decisions), started and
+# shut down by the app lifespan. Workers come from a fork server (spawned where that's unavailable),
+# so they never inherit the event loop's threads or open database connections
+_pool: Optional[ProcessPoolExecutor] = None
+
+def start_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        _pool = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=context)
+    return _pool
+
+def get_pool() -> ProcessPoolExecutor:
+    if _pool is None:
+        raise RuntimeError("Worker pool is not running; it is started by the app lifespan")
+    return _pool
+
+def shutdown_pool():
+    # Queued work is cancelled; solves already running are waited for
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
@@ -3,6 +3,8 @@ Main Demo Script for Railway AI Optimization System
 Demonstrates the complete workflow from data loading to visualization
 """
 from algorithms.milp_optimizer import MILPOptimizer
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 import os
 from algorithms.comprehensive_hybrid_optimizer import ComprehensiveHybridOptimizer
@@ -10,6 +12,9 @@ from algorithms.priority_engine import PriorityEngine
 from visualization.visualizer import TrainVisualizer
 from algorithms.realtime_optimizer import RealtimeOptimizer
 
+# Explicit dtypes skip pandas' inference pass and keep train_type as compact category codes
+TRAIN_DTYPES = {'priority': 'int8', 'delay_minutes': 'int32', 'train_type': 'category'}
+
 
 def main():
     print("🚆" * 20)
@@ -26,7 +31,7 @@ def main():
     try:
         stations = pd.read_csv("data/stations.csv")
         sections = pd.read_csv("data/sections.csv")
-        trains = pd.read_csv("data/trains.csv")
+        trains = pd.read_csv("data/trains.csv", dtype=TRAIN_DTYPES)
         train_sections = pd.read_csv("data/train_sections.csv")
         disruptions = pd.read_csv("data/disruptions.csv")
 
@@ -54,15 +59,14 @@ def main():
 
 
     print("🎯 Train Priority Rankings (Top 10):")
-    top_10 = priority_matrix.head(10)
-    for _, train in top_10.iterrows():
-        print(f"   {train['rank']:2d}. {train['train_name'][:20]:20s} ({train['train_type']}) - Priority: {train['priority_score']:.2f}")
+    top_10 = priority_matrix.head(10)[['rank', 'train_name', 'train_type', 'priority_score']].to_numpy()
+    print("\n".join(f"   {rank:2d}. {name[:20]:20s} ({train_type}) - Priority: {score:.2f}"
+                    for rank, name, train_type, score in top_10))
 
 
     print("\n📝 Priority Decision Examples:")
-    for i in range(min(3, len(trains))):
-        train = trains.iloc[i]
-        explanation = priority_engine.get_priority_explanation(train.to_dict())
+    for train in trains.head(3).to_dict(orient='records'):
+        explanation = priority_engine.get_priority_explanation(train)
         print(f"   • {train['train_name']}: {explanation}")
 
 
@@ -74,9 +78,23 @@ def main():
     print("\n⚙️  Running MILP Optimizer (small scale)...")
     milp_optimizer = MILPOptimizer()
     milp_trains = trains.head(10)
-    milp_train_sections = train_sections[train_sections['train_id'].isin(milp_trains['train_id'])]
-    milp_sections = sections[sections['section_id'].isin(milp_train_sections['section_id'].unique())]
-    milp_schedule = milp_optimizer.optimize(milp_trains, milp_sections, milp_train_sections)
+    # Hash-indexed by train, so the subset is a lookup per train instead of a scan of every row
+    ts_by_train = train_sections.set_index('train_id', drop=False)
+    milp_train_sections = ts_by_train.loc[ts_by_train.index.intersection(milp_trains['train_id'])].reset_index(drop=True)
+    # isin hashes the values itself, so the section ids need no separate unique() pass
+    milp_sections = sections[sections['section_id'].isin(milp_train_sections['section_id'])]
+    # The two optimizers are independent and CPU-bound, so the MILP solves in a worker process
+    # while the hybrid runs here; the frames are pickled to the worker once
+    milp_pool = ProcessPoolExecutor(max_workers=1)
+    milp_job = milp_pool.submit(milp_optimizer.optimize, milp_trains, milp_sections, milp_train_sections)
+
+    # Run comprehensive hybrid optimizer on full data (recommended)
+    print("\n⚙️  Running Comprehensive Hybrid Optimizer...")
+    comprehensive_optimizer = ComprehensiveHybridOptimizer()
+    comprehensive_result = comprehensive_optimizer.optimize(trains, sections, train_sections)
+
+    milp_schedule = milp_job.result()
+    milp_pool.shutdown()
     if milp_schedule:
         print("✅ MILP Optimization Completed:")
         for train_id, sched in milp_schedule.items():
@@ -85,11 +103,6 @@ def main():
                 print(f"  Section {s['section_id']} Start: {s['start_time']:.2f} min")
     else:
         print("❌ MILP optimization failed or no solution")
-
-    # Run comprehensive hybrid optimizer on full data (recommended)
-    print("\n⚙️  Running Comprehensive Hybrid Optimizer...")
-    comprehensive_optimizer = ComprehensiveHybridOptimizer()
-    comprehensive_result = comprehensive_optimizer.optimize(trains, sections, train_sections)
     
     # Create results list with comprehensive result
     results = [comprehensive_result] if comprehensive_result.success else []
@@ -128,22 +141,23 @@ def main():
     print("\n🎨 Step 4: Generating Visualizations...")
     print("-" * 40)
     visualizer = TrainVisualizer()
-
-
-    visualizer.create_all_visualizations(trains, sections, train_sections)
+    # The plots are drawn in the background while the report and exports below continue. A single
+    # worker because a TrainVisualizer's figure cache and save queue are not thread-safe
+    plot_pool = ThreadPoolExecutor(max_workers=1)
+    plot_jobs = [plot_pool.submit(visualizer.create_all_visualizations, trains, sections, train_sections)]
 
 
     if results and any(r.success for r in results):
         successful_results = [r for r in results if r.success]
-        visualizer.plot_optimization_comparison(successful_results)
+        plot_jobs.append(plot_pool.submit(visualizer.plot_optimization_comparison, successful_results))
         for result in results:
             if result.method == "Genetic Algorithm" and result.fitness_history:
-                visualizer.plot_ga_convergence(result.fitness_history)
+                plot_jobs.append(plot_pool.submit(visualizer.plot_ga_convergence, result.fitness_history))
                 break
 
 
     if best_result and best_result.schedule:
-        visualizer.plot_train_timeline(best_result.schedule)
+        plot_jobs.append(plot_pool.submit(visualizer.plot_train_timeline, best_result.schedule))
 
 
     # Step 5: Generate Summary Report
@@ -154,7 +168,8 @@ def main():
 
     # Additional insights
     print("\n🔍 Additional Insights:")
-    peak_trains = trains[trains['scheduled_start_time'].str.contains('08:|09:|17:|18:|19:', na=False)]
+    start_hours = pd.to_numeric(trains['scheduled_start_time'].str.slice(0, 2), errors='coerce').astype('Int8')
+    peak_trains = trains[start_hours.isin([8, 9, 17, 18, 19])]
     if len(peak_trains) > 0:
         print(f"   • Peak hour trains: {len(peak_trains)} ({len(peak_trains)/len(trains)*100:.1f}%)")
 
@@ -171,9 +186,18 @@ def main():
 
 
     if 'train_type' in trains.columns and 'delay_minutes' in trains.columns:
-        avg_delay_by_type = trains.groupby('train_type')['delay_minutes'].mean().sort_values(ascending=False)
-        worst_type = avg_delay_by_type.index[0] if len(avg_delay_by_type) > 0 else "N/A"
-        print(f"   • Highest delayed type: {worst_type} (avg: {avg_delay_by_type.iloc[0]:.1f} min)")
+        # train_type is categorical, so the per-type mean is two bincounts over its codes
+        train_types = trains['train_type'].cat.categories
+        codes = trains['train_type'].cat.codes.to_numpy()
+        delay = trains['delay_minutes'].to_numpy(np.float64)
+        valid = (codes >= 0) & ~np.isnan(delay)
+        counts = np.bincount(codes[valid], minlength=len(train_types))
+        delay_sums = np.bincount(codes[valid], weights=delay[valid], minlength=len(train_types))
+        observed = counts > 0
+        if observed.any():
+            avg_delay_by_type = delay_sums[observed] / counts[observed]
+            worst = avg_delay_by_type.argmax()
+            print(f"   • Highest delayed type: {train_types[observed][worst]} (avg: {avg_delay_by_type[worst]:.1f} min)")
 
 
     # Step 6: Export Results
@@ -209,20 +233,17 @@ def main():
 
 
         if best_result and best_result.schedule:
-            schedule_data = []
-            for train_id, schedule in best_result.schedule.items():
-                for section_info in schedule:
-                    schedule_data.append({
-                        'train_id': train_id,
-                        'section_id': section_info['section_id'],
-                        'entry_time': section_info['entry_time'],
-                        'exit_time': section_info['exit_time'],
-                        'delay_added': section_info.get('delay_added', 0)
-                    })
-
-
-            if schedule_data:
-                schedule_df = pd.DataFrame(schedule_data)
+            # Rows are streamed as tuples straight into the frame rather than collected as dicts
+            schedule_rows = ((train_id, section_info['section_id'], section_info['entry_time'],
+                              section_info['exit_time'], section_info.get('delay_added', 0))
+                             for train_id, schedule in best_result.schedule.items()
+                             for section_info in schedule)
+            schedule_df = pd.DataFrame.from_records(
+                schedule_rows, columns=['train_id', 'section_id', 'entry_time', 'exit_time', 'delay_added']
+            )
+
+
+            if not schedule_df.empty:
                 schedule_df.to_csv('results/optimized_schedule.csv', index=False)
                 print("✅ Optimized schedule saved to results/optimized_schedule.csv")
 
@@ -231,6 +252,13 @@ def main():
         print(f"⚠️  Export warning: {e}")
 
 
+    # Wait for the background plots, then for their PNG saves; both re-raise any plotting error here
+    for job in plot_jobs:
+        job.result()
+    plot_pool.shutdown()
+    visualizer.flush()
+
+
     # Step 7: Next Steps Recommendation
     print(f"\n🎯 Step 7: Next Steps for Phase 3...")
     print("-" * 40)
@@ -275,7 +303,7 @@ def create_sample_disruption():
 
 
     try:
-        trains = pd.read_csv("data/trains.csv")
+        trains = pd.read_csv("data/trains.csv", dtype=TRAIN_DTYPES)
         sections = pd.read_csv("data/sections.csv")
         train_sections = pd.read_csv("data/train_sections.csv")
     except Exception as e:
@@ -287,7 +315,8 @@ def create_sample_disruption():
     print("🔄 Re-optimizing affected trains...")
 
 
-    affected_trains = train_sections[train_sections['section_id'] == 'S001']['train_id'].unique()
+    ts_by_section = train_sections.set_index('section_id', drop=False)
+    affected_trains = ts_by_section.loc[['S001'], 'train_id'].unique() if 'S001' in ts_by_section.index else []
 
 
     if len(affected_trains) > 0:
@@ -300,7 +329,10 @@ def create_sample_disruption():
 
         optimizer = ComprehensiveHybridOptimizer()
         original_results = optimizer.optimize(trains, sections, train_sections)
-        disrupted_results = optimizer.optimize(disrupted_trains, sections, train_sections)
+        # Only the affected trains changed, so they alone are re-placed in the original schedule
+        disrupted_results = optimizer.reoptimize(disrupted_trains, sections, train_sections,
+                                                 original_results.schedule if original_results.success else None,
+                                                 affected_trains)
 
 
         if original_results.success and disrupted_results.success:
@@ -3,41 +3,47 @@ Endpoint Testing Script for Railway AI
 Tests all optimization endpoints after comprehensive hybrid integration
 """
 
-import requests
+import asyncio
+import importlib.util
 import json
-import time
-import sys
+import httpx
 
-def test_endpoint(base_url, endpoint, method="GET", params=None, data=None):
-    """Test a single endpoint"""
-    url = f"{base_url}{endpoint}"
-    
+# HTTP/2 needs the optional h2 package (httpx[http2]); without it the client keeps pooled
+# keep-alive HTTP/1.1 connections
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+async def fetch_endpoint(client, endpoint, method="GET", params=None, data=None):
+    """Request a single endpoint; connection errors are returned rather than raised"""
     try:
         if method == "GET":
-            response = requests.get(url, params=params, timeout=30)
+            return await client.get(endpoint, params=params)
         elif method == "POST":
-            response = requests.post(url, json=data, timeout=30)
-        
-        print(f"✅ {method} {endpoint}")
-        print(f"   Status: {response.status_code}")
-        
-        if response.status_code == 200:
-            try:
-                result = response.json()
-                print(f"   Response: {json.dumps(result, indent=2)[:200]}...")
-            except:
-                print(f"   Response: {response.text[:200]}...")
-        else:
-            print(f"   Error: {response.text}")
-        
-        return response.status_code == 200
-        
-    except requests.exceptions.RequestException as e:
+            return await client.post(endpoint, json=data)
+    except httpx.HTTPError as e:
+        return e
+
+def report_endpoint(endpoint, method, response):
+    """Report the outcome of a single endpoint request"""
+    if isinstance(response, httpx.HTTPError):
         print(f"❌ {method} {endpoint}")
-        print(f"   Error: {e}")
+        print(f"   Error: {response}")
         return False
+    
+    print(f"✅ {method} {endpoint}")
+    print(f"   Status: {response.status_code}")
+    
+    if response.status_code == 200:
+        try:
+            result = response.json()
+            print(f"   Response: {json.dumps(result, indent=2)[:200]}...")
+        except:
+            print(f"   Response: {response.text[:200]}...")
+    else:
+        print(f"   Error: {response.text}")
+    
+    return response.status_code == 200
 
-def main():
+async def main():
     print("🚀 Railway AI - Endpoint Testing")
     print("=" * 50)
     
@@ -45,24 +51,7 @@ def main():
     
     # Wait for server to start
     print("⏳ Waiting for server to start...")
-    time.sleep(5)
-    
-    # Test server health
-    print("\n📡 Testing Server Health...")
-    try:
-        response = requests.get(f"{base_url}/", timeout=10)
-        if response.status_code == 200:
-            print("✅ Server is running")
-        else:
-            print(f"❌ Server health check failed: {response.status_code}")
-            return
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Cannot connect to server: {e}")
-        print("   Make sure the server is running with: uvicorn backend.app.main:app --reload")
-        return
-    
-    # Test optimization endpoints
-    print("\n🔧 Testing Optimization Endpoints...")
+    await asyncio.sleep(5)
     
     optimization_methods = [
         "comprehensive_hybrid",
@@ -70,9 +59,46 @@ def main():
         "rl"
     ]
     
-    for method in optimization_methods:
+    other_endpoints = [
+        ("/stations/", "GET"),
+        ("/sections/", "GET"), 
+        ("/trains/", "GET"),
+        ("/train_sections/", "GET"),
+        ("/live-trains/", "GET"),
+        ("/conflict-alerts/", "GET")
+    ]
+    
+    # One pooled client for every request (multiplexed over HTTP/2 when available)
+    async with httpx.AsyncClient(base_url=base_url, timeout=30, http2=HTTP2_AVAILABLE) as client:
+        # Test server health
+        print("\n📡 Testing Server Health...")
+        try:
+            response = await client.get("/", timeout=10)
+            if response.status_code == 200:
+                print("✅ Server is running")
+            else:
+                print(f"❌ Server health check failed: {response.status_code}")
+                return
+        except httpx.HTTPError as e:
+            print(f"❌ Cannot connect to server: {e}")
+            print("   Make sure the server is running with: uvicorn backend.app.main:app --reload")
+            return
+        
+        # All endpoints are requested concurrently, so the sweep takes about as long as the
+        # slowest one; results are reported in order below
+        optimization_responses, other_responses = await asyncio.gather(
+            asyncio.gather(*[fetch_endpoint(client, "/optimize/", params={"method": method})
+                             for method in optimization_methods]),
+            asyncio.gather(*[fetch_endpoint(client, endpoint, method)
+                             for endpoint, method in other_endpoints]),
+        )
+    
+    # Test optimization endpoints
+    print("\n🔧 Testing Optimization Endpoints...")
+    
+    for method, response in zip(optimization_methods, optimization_responses):
         print(f"\n--- Testing {method.upper()} Optimizer ---")
-        success = test_endpoint(base_url, "/optimize/", params={"method": method})
+        success = report_endpoint("/optimize/", "GET", response)
         
         if success:
             print(f"✅ {method} endpoint working")
@@ -82,17 +108,8 @@ def main():
     # Test other endpoints
     print("\n📊 Testing Other Endpoints...")
     
-    other_endpoints = [
-        ("/stations/", "GET"),
-        ("/sections/", "GET"), 
-        ("/trains/", "GET"),
-        ("/train_sections/", "GET"),
-        ("/live-trains/", "GET"),
-        ("/conflict-alerts/", "GET")
-    ]
-    
-    for endpoint, method in other_endpoints:
-        success = test_endpoint(base_url, endpoint, method)
+    for (endpoint, method), response in zip(other_endpoints, other_responses):
+        success = report_endpoint(endpoint, method, response)
         if success:
             print(f"✅ {endpoint} working")
         else:
@@ -102,4 +119,4 @@ def main():
     print("=" * 50)
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
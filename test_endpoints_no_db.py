@@ -7,45 +7,90 @@ import sys
 import os
 sys.path.append('.')
 
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache, partial
+
+import numpy as np
 import pandas as pd
 from algorithms.comprehensive_hybrid_optimizer import ComprehensiveHybridOptimizer
 
+# Fixture columns as (values, dtype); explicit dtypes spare pandas inferring each column
+_TRAINS_SPEC = {
+    'train_id': (['T001', 'T002', 'T003', 'T004', 'T005'], "object"),
+    'train_name': (['Rajdhani Express', 'Shatabdi Express', 'Passenger Train', 'Freight Train', 'Local Train'], "object"),
+    'train_type': (['Rajdhani', 'Express', 'Passenger', 'Freight', 'Local'], "object"),
+    'priority': ([1, 2, 4, 6, 5], "int64"),
+    'delay_minutes': ([0, 5, 10, 15, 8], "int64"),
+    'scheduled_start_time': (['08:00', '09:30', '11:00', '14:00', '16:00'], "object"),
+    'max_speed_kmph': ([130, 110, 80, 60, 70], "int64"),
+}
+
+_SECTIONS_SPEC = {
+    'section_id': (['S001', 'S002', 'S003', 'S004'], "object"),
+    'from_station': (['DEL', 'GZB', 'AGR', 'BPL'], "object"),
+    'to_station': (['GZB', 'AGR', 'BPL', 'MUM'], "object"),
+    'length_km': ([50, 80, 120, 200], "int64"),
+    'max_trains_allowed': ([3, 2, 4, 3], "int64"),
+    'track_type': (['Double', 'Single', 'Double', 'Double'], "object"),
+}
+
+_TRAIN_SECTIONS_SPEC = {
+    'train_id': (['T001', 'T001', 'T002', 'T003', 'T004', 'T005'], "object"),
+    'section_id': (['S001', 'S002', 'S001', 'S001', 'S003', 'S002'], "object"),
+    'scheduled_entry_time': (['08:00', '08:45', '09:30', '11:00', '14:00', '16:00'], "object"),
+    'scheduled_exit_time': (['08:30', '09:15', '10:00', '11:30', '15:00', '16:30'], "object"),
+    'start_time': ([800, 845, 930, 1100, 1400, 1600], "int64"),
+    'end_time': ([830, 915, 1000, 1130, 1500, 1630], "int64"),
+    'priority': ([1, 1, 2, 4, 6, 5], "int64"),
+}
+
+def _frame(spec):
+    return pd.DataFrame({col: np.asarray(values, dtype=dtype) for col, (values, dtype) in spec.items()})
+
+@cache
 def create_test_data():
     """Create comprehensive test data"""
-    trains_data = {
-        'train_id': ['T001', 'T002', 'T003', 'T004', 'T005'],
-        'train_name': ['Rajdhani Express', 'Shatabdi Express', 'Passenger Train', 'Freight Train', 'Local Train'],
-        'train_type': ['Rajdhani', 'Express', 'Passenger', 'Freight', 'Local'],
-        'priority': [1, 2, 4, 6, 5],
-        'delay_minutes': [0, 5, 10, 15, 8],
-        'scheduled_start_time': ['08:00', '09:30', '11:00', '14:00', '16:00'],
-        'max_speed_kmph': [130, 110, 80, 60, 70]
-    }
-    
-    sections_data = {
-        'section_id': ['S001', 'S002', 'S003', 'S004'],
-        'from_station': ['DEL', 'GZB', 'AGR', 'BPL'],
-        'to_station': ['GZB', 'AGR', 'BPL', 'MUM'],
-        'length_km': [50, 80, 120, 200],
-        'max_trains_allowed': [3, 2, 4, 3],
-        'track_type': ['Double', 'Single', 'Double', 'Double']
-    }
-    
-    train_sections_data = {
-        'train_id': ['T001', 'T001', 'T002', 'T003', 'T004', 'T005'],
-        'section_id': ['S001', 'S002', 'S001', 'S001', 'S003', 'S002'],
-        'scheduled_entry_time': ['08:00', '08:45', '09:30', '11:00', '14:00', '16:00'],
-        'scheduled_exit_time': ['08:30', '09:15', '10:00', '11:30', '15:00', '16:30'],
-        'start_time': [800, 845, 930, 1100, 1400, 1600],
-        'end_time': [830, 915, 1000, 1130, 1500, 1630],
-        'priority': [1, 1, 2, 4, 6, 5]
-    }
-    
-    return (
-        pd.DataFrame(trains_data),
-        pd.DataFrame(sections_data), 
-        pd.DataFrame(train_sections_data)
-    )
+    # Built once and shared by every test; the optimizers only read these frames
+    return _frame(_TRAINS_SPEC), _frame(_SECTIONS_SPEC), _frame(_TRAIN_SECTIONS_SPEC)
+
+def _run_config(config, trains_df, sections_df, train_sections_df):
+    """Optimize once with one configuration (top-level so worker processes can run it)"""
+    try:
+        optimizer = ComprehensiveHybridOptimizer(
+            aco_params=config['aco_params'],
+            ga_params=config['ga_params']
+        )
+        
+        result = optimizer.optimize(trains_df, sections_df, train_sections_df)
+        
+        if result.success:
+            return {
+                'config': config['name'],
+                'success': True,
+                'method': result.method,
+                'time': result.computation_time,
+                'delay': result.total_delay,
+                'conflicts': result.conflicts_resolved,
+                'throughput': result.throughput
+            }
+        return {
+            'config': config['name'],
+            'success': False,
+            'method': result.method,
+            'time': 0,
+            'delay': float('inf'),
+            'conflicts': 0
+        }
+        
+    except Exception as e:
+        return {
+            'config': config['name'],
+            'success': False,
+            'error': str(e),
+            'time': 0,
+            'delay': float('inf'),
+            'conflicts': 0
+        }
 
 def test_comprehensive_hybrid_performance():
     """Test comprehensive hybrid optimizer performance"""
@@ -61,97 +106,75 @@ def test_comprehensive_hybrid_performance():
         {"name": "Thorough", "aco_params": {"population_size": 30, "iterations": 30}, "ga_params": {"population_size": 40, "generations": 40}}
     ]
     
-    results = []
+    # The configurations are independent CPU-bound runs, so each gets its own process
+    with ProcessPoolExecutor(max_workers=len(configs)) as ex:
+        results = list(ex.map(partial(_run_config, trains_df=trains_df, sections_df=sections_df,
+                                      train_sections_df=train_sections_df), configs))
     
-    for config in configs:
-        print(f"\n--- Testing {config['name']} Configuration ---")
-        
-        try:
-            optimizer = ComprehensiveHybridOptimizer(
-                aco_params=config['aco_params'],
-                ga_params=config['ga_params']
-            )
-            
-            result = optimizer.optimize(trains_df, sections_df, train_sections_df)
-            
-            if result.success:
-                print(f"✅ Success: {result.method}")
-                print(f"   Computation Time: {result.computation_time:.2f}s")
-                print(f"   Total Delay: {result.total_delay:.1f}")
-                print(f"   Conflicts Resolved: {result.conflicts_resolved}")
-                print(f"   Throughput: {result.throughput}")
-                
-                results.append({
-                    'config': config['name'],
-                    'success': True,
-                    'time': result.computation_time,
-                    'delay': result.total_delay,
-                    'conflicts': result.conflicts_resolved
-                })
-            else:
-                print(f"❌ Failed: {result.method}")
-                results.append({
-                    'config': config['name'],
-                    'success': False,
-                    'time': 0,
-                    'delay': float('inf'),
-                    'conflicts': 0
-                })
-                
-        except Exception as e:
-            print(f"❌ Error: {e}")
-            results.append({
-                'config': config['name'],
-                'success': False,
-                'time': 0,
-                'delay': float('inf'),
-                'conflicts': 0
-            })
+    for result in results:
+        print(f"\n--- {result['config']} Configuration ---")
+        if result['success']:
+            print(f"✅ Success: {result['method']}")
+            print(f"   Computation Time: {result['time']:.2f}s")
+            print(f"   Total Delay: {result['delay']:.1f}")
+            print(f"   Conflicts Resolved: {result['conflicts']}")
+            print(f"   Throughput: {result['throughput']}")
+        elif 'error' in result:
+            print(f"❌ Error: {result['error']}")
+        else:
+            print(f"❌ Failed: {result['method']}")
     
     return results
 
+def _run_once(run, trains_df, sections_df, train_sections_df):
+    """One default-configured optimization run (top-level so worker processes can run it)"""
+    try:
+        # Built in the worker, so every run draws its own seed rather than sharing a forked RNG state
+        result = ComprehensiveHybridOptimizer().optimize(trains_df, sections_df, train_sections_df)
+        
+        if result.success:
+            return {
+                'run': run,
+                'success': True,
+                'delay': result.total_delay,
+                'time': result.computation_time
+            }
+        return {
+            'run': run,
+            'success': False,
+            'delay': float('inf'),
+            'time': 0
+        }
+        
+    except Exception as e:
+        return {
+            'run': run,
+            'success': False,
+            'error': str(e),
+            'delay': float('inf'),
+            'time': 0
+        }
+
 def test_optimization_consistency():
     """Test optimization consistency across multiple runs"""
     print("\n🔄 Testing Optimization Consistency")
     print("-" * 60)
     
     trains_df, sections_df, train_sections_df = create_test_data()
-    optimizer = ComprehensiveHybridOptimizer()
     
     runs = 3
-    results = []
+    with ProcessPoolExecutor(max_workers=runs) as ex:
+        results = list(ex.map(partial(_run_once, trains_df=trains_df, sections_df=sections_df,
+                                      train_sections_df=train_sections_df), range(1, runs + 1)))
     
-    for i in range(runs):
-        print(f"\n--- Run {i+1}/{runs} ---")
-        
-        try:
-            result = optimizer.optimize(trains_df, sections_df, train_sections_df)
-            
-            if result.success:
-                print(f"✅ Success: {result.total_delay:.1f} delay, {result.computation_time:.2f}s")
-                results.append({
-                    'run': i+1,
-                    'success': True,
-                    'delay': result.total_delay,
-                    'time': result.computation_time
-                })
-            else:
-                print(f"❌ Failed")
-                results.append({
-                    'run': i+1,
-                    'success': False,
-                    'delay': float('inf'),
-                    'time': 0
-                })
-                
-        except Exception as e:
-            print(f"❌ Error: {e}")
-            results.append({
-                'run': i+1,
-                'success': False,
-                'delay': float('inf'),
-                'time': 0
-            })
+    for result in results:
+        print(f"\n--- Run {result['run']}/{runs} ---")
+        if result['success']:
+            print(f"✅ Success: {result['delay']:.1f} delay, {result['time']:.2f}s")
+        elif 'error' in result:
+            print(f"❌ Error: {result['error']}")
+        else:
+            print(f"❌ Failed")
     
     return results
 
@@ -3,81 +3,115 @@ HTTP Endpoint Testing Script
 Tests the FastAPI endpoints via HTTP requests
 """
 
-import requests
-import json
-import time
+import asyncio
+import importlib.util
+import httpx
 
-def test_endpoint(base_url, endpoint, method="GET", params=None):
-    """Test a single endpoint"""
-    url = f"{base_url}{endpoint}"
-    
+# HTTP/2 needs the optional h2 package (httpx[http2]) and is only negotiated over TLS;
+# against the plain-HTTP dev server the client stays on keep-alive HTTP/1.1
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+async def fetch_endpoint(client, endpoint, method="GET", params=None):
+    """Request a single endpoint; connection errors are returned rather than raised"""
     try:
         if method == "GET":
-            response = requests.get(url, params=params, timeout=30)
-        
-        print(f"✅ {method} {endpoint}")
-        print(f"   Status: {response.status_code}")
-        
-        if response.status_code == 200:
-            try:
-                data = response.json()
-                print(f"   Success: {data.get('data', {}).get('success', 'Unknown')}")
-                print(f"   Method: {data.get('data', {}).get('method', 'Unknown')}")
-                print(f"   Trains: {data.get('data', {}).get('trains_count', 'Unknown')}")
-                if 'total_delay' in data.get('data', {}):
-                    print(f"   Total Delay: {data.get('data', {}).get('total_delay', 'Unknown')}")
-                if 'computation_time' in data.get('data', {}):
-                    print(f"   Computation Time: {data.get('data', {}).get('computation_time', 'Unknown')}")
-            except Exception as e:
-                print(f"   Response: {response.text[:200]}...")
-        else:
-            print(f"   Error: {response.text[:200]}")
-        
-        return response.status_code == 200
-        
-    except requests.exceptions.RequestException as e:
+            return await client.get(endpoint, params=params)
+    except httpx.HTTPError as e:
+        return e
+
+def report_endpoint(endpoint, method, response):
+    """Print the outcome of a single endpoint request"""
+    if isinstance(response, httpx.HTTPError):
         print(f"❌ {method} {endpoint}")
-        print(f"   Error: {e}")
+        print(f"   Error: {response}")
         return False
+    
+    print(f"✅ {method} {endpoint}")
+    print(f"   Status: {response.status_code}")
+    
+    if response.status_code == 200:
+        try:
+            data = response.json()
+            print(f"   Success: {data.get('data', {}).get('success', 'Unknown')}")
+            print(f"   Method: {data.get('data', {}).get('method', 'Unknown')}")
+            print(f"   Trains: {data.get('data', {}).get('trains_count', 'Unknown')}")
+            if 'total_delay' in data.get('data', {}):
+                print(f"   Total Delay: {data.get('data', {}).get('total_delay', 'Unknown')}")
+            if 'computation_time' in data.get('data', {}):
+                print(f"   Computation Time: {data.get('data', {}).get('computation_time', 'Unknown')}")
+        except Exception as e:
+            print(f"   Response: {response.text[:200]}...")
+    else:
+        print(f"   Error: {response.text[:200]}")
+    
+    return response.status_code == 200
 
-def main():
+async def wait_for_server(client, attempts=50):
+    """Poll the root endpoint until the server answers"""
+    for _ in range(attempts):
+        try:
+            return await client.get("/")
+        except httpx.HTTPError as e:
+            error = e
+            await asyncio.sleep(0.1)
+    raise error
+
+async def main():
     print("🚀 Railway AI - HTTP Endpoint Testing")
     print("=" * 50)
     
     base_url = "http://127.0.0.1:8000"
     
-    # Wait for server to start
-    print("⏳ Waiting for server to start...")
-    time.sleep(5)
-    
-    # Test server health
-    print("\n📡 Testing Server Health...")
-    try:
-        response = requests.get(f"{base_url}/", timeout=10)
-        if response.status_code == 200:
-            print("✅ Server is running")
-        else:
-            print(f"❌ Server health check failed: {response.status_code}")
+    # One pooled client: every request below reuses its keep-alive (or multiplexed HTTP/2) connections
+    async with httpx.AsyncClient(base_url=base_url, timeout=30, http2=HTTP2_AVAILABLE) as client:
+        # Wait for server to start
+        print("⏳ Waiting for server to start...")
+        
+        # Test server health
+        print("\n📡 Testing Server Health...")
+        try:
+            response = await wait_for_server(client)
+            if response.status_code == 200:
+                print("✅ Server is running")
+            else:
+                print(f"❌ Server health check failed: {response.status_code}")
+                return
+        except httpx.HTTPError as e:
+            print(f"❌ Cannot connect to server: {e}")
+            print("   Make sure the server is running with: uvicorn backend.app.main:app --reload")
             return
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Cannot connect to server: {e}")
-        print("   Make sure the server is running with: uvicorn backend.app.main:app --reload")
-        return
+        
+        optimization_methods = [
+            "comprehensive_hybrid",
+            "milp", 
+            "rl"
+        ]
+        
+        other_endpoints = [
+            ("/stations/", "GET"),
+            ("/sections/", "GET"), 
+            ("/trains/", "GET"),
+            ("/train_sections/", "GET"),
+            ("/live-trains/", "GET"),
+            ("/conflict-alerts/", "GET")
+        ]
+        
+        # All endpoints are requested concurrently; results are reported in order below
+        optimization_responses, other_responses = await asyncio.gather(
+            asyncio.gather(*[fetch_endpoint(client, "/optimize/", params={"method": method})
+                             for method in optimization_methods]),
+            asyncio.gather(*[fetch_endpoint(client, endpoint, method)
+                             for endpoint, method in other_endpoints]),
+        )
     
     # Test optimization endpoints
     print("\n🔧 Testing Optimization Endpoints...")
     
-    optimization_methods = [
-        "comprehensive_hybrid",
-        "milp", 
-        "rl"
-    ]
-    
     results = {}
     
-    for method in optimization_methods:
+    for method, response in zip(optimization_methods, optimization_responses):
         print(f"\n--- Testing {method.upper()} ---")
-        success = test_endpoint(base_url, "/optimize/", params={"method": method})
+        success = report_endpoint("/optimize/", "GET", response)
         results[method] = success
         
         if success:
@@ -88,19 +122,10 @@ def main():
     # Test other endpoints
     print("\n📊 Testing Other Endpoints...")
     
-    other_endpoints = [
-        ("/stations/", "GET"),
-        ("/sections/", "GET"), 
-        ("/trains/", "GET"),
-        ("/train_sections/", "GET"),
-        ("/live-trains/", "GET"),
-        ("/conflict-alerts/", "GET")
-    ]
-    
     other_results = {}
     
-    for endpoint, method in other_endpoints:
-        success = test_endpoint(base_url, endpoint, method)
+    for (endpoint, method), response in zip(other_endpoints, other_responses):
+        success = report_endpoint(endpoint, method, response)
         other_results[endpoint] = success
         if success:
             print(f"✅ {endpoint} working")
@@ -132,4 +157,4 @@ def main():
         print("⚠️  Some other endpoints failed.")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -7,46 +7,51 @@ import sys
 import os
 sys.path.append('.')
 
+from functools import cache
+
+import numpy as np
 import pandas as pd
 from algorithms.comprehensive_hybrid_optimizer import ComprehensiveHybridOptimizer
 from backend.app.routes.optimization import comprehensive_hybrid_optimizer, milp_optimizer, rl_optimizer
 
+# Fixture columns as (values, dtype); explicit dtypes spare pandas inferring each column
+_TRAINS_SPEC = {
+    'train_id': (['T001', 'T002', 'T003', 'T004'], "object"),
+    'train_name': (['Rajdhani Express', 'Shatabdi Express', 'Passenger Train', 'Freight Train'], "object"),
+    'train_type': (['Rajdhani', 'Express', 'Passenger', 'Freight'], "object"),
+    'priority': ([1, 2, 4, 6], "int64"),
+    'delay_minutes': ([0, 5, 10, 15], "int64"),
+    'scheduled_start_time': (['08:00', '09:30', '11:00', '14:00'], "object"),
+    'max_speed_kmph': ([130, 110, 80, 60], "int64"),
+}
+
+_SECTIONS_SPEC = {
+    'section_id': (['S001', 'S002', 'S003'], "object"),
+    'from_station': (['DEL', 'GZB', 'AGR'], "object"),
+    'to_station': (['GZB', 'AGR', 'BPL'], "object"),
+    'length_km': ([50, 80, 120], "int64"),
+    'max_trains_allowed': ([3, 2, 4], "int64"),
+    'track_type': (['Double', 'Single', 'Double'], "object"),
+}
+
+_TRAIN_SECTIONS_SPEC = {
+    'train_id': (['T001', 'T001', 'T002', 'T003', 'T004'], "object"),
+    'section_id': (['S001', 'S002', 'S001', 'S001', 'S003'], "object"),
+    'scheduled_entry_time': (['08:00', '08:45', '09:30', '11:00', '14:00'], "object"),
+    'scheduled_exit_time': (['08:30', '09:15', '10:00', '11:30', '15:00'], "object"),
+    'start_time': ([800, 845, 930, 1100, 1400], "int64"),
+    'end_time': ([830, 915, 1000, 1130, 1500], "int64"),
+    'priority': ([1, 1, 2, 4, 6], "int64"),
+}
+
+def _frame(spec):
+    return pd.DataFrame({col: np.asarray(values, dtype=dtype) for col, (values, dtype) in spec.items()})
+
+@cache
 def create_test_data():
     """Create test data for optimization"""
-    trains_data = {
-        'train_id': ['T001', 'T002', 'T003', 'T004'],
-        'train_name': ['Rajdhani Express', 'Shatabdi Express', 'Passenger Train', 'Freight Train'],
-        'train_type': ['Rajdhani', 'Express', 'Passenger', 'Freight'],
-        'priority': [1, 2, 4, 6],
-        'delay_minutes': [0, 5, 10, 15],
-        'scheduled_start_time': ['08:00', '09:30', '11:00', '14:00'],
-        'max_speed_kmph': [130, 110, 80, 60]
-    }
-    
-    sections_data = {
-        'section_id': ['S001', 'S002', 'S003'],
-        'from_station': ['DEL', 'GZB', 'AGR'],
-        'to_station': ['GZB', 'AGR', 'BPL'],
-        'length_km': [50, 80, 120],
-        'max_trains_allowed': [3, 2, 4],
-        'track_type': ['Double', 'Single', 'Double']
-    }
-    
-    train_sections_data = {
-        'train_id': ['T001', 'T001', 'T002', 'T003', 'T004'],
-        'section_id': ['S001', 'S002', 'S001', 'S001', 'S003'],
-        'scheduled_entry_time': ['08:00', '08:45', '09:30', '11:00', '14:00'],
-        'scheduled_exit_time': ['08:30', '09:15', '10:00', '11:30', '15:00'],
-        'start_time': [800, 845, 930, 1100, 1400],
-        'end_time': [830, 915, 1000, 1130, 1500],
-        'priority': [1, 1, 2, 4, 6]
-    }
-    
-    return (
-        pd.DataFrame(trains_data),
-        pd.DataFrame(sections_data), 
-        pd.DataFrame(train_sections_data)
-    )
+    # Built once and shared by every test; the optimizers only read these frames
+    return _frame(_TRAINS_SPEC), _frame(_SECTIONS_SPEC), _frame(_TRAIN_SECTIONS_SPEC)
 
 def test_comprehensive_hybrid_direct():
     """Test comprehensive hybrid optimizer directly"""
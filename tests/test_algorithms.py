@@ -78,9 +78,10 @@ class TestPriorityEngine(unittest.TestCase):
 class TestOptimizationAlgorithms(unittest.TestCase):
     """Test cases for optimization algorithms"""
     
-    def setUp(self):
-        # Create sample data
-        self.trains_df = pd.DataFrame({
+    @classmethod
+    def setUpClass(cls):
+        # Create sample data once per class; the optimizers never modify their input frames
+        cls.trains_df = pd.DataFrame({
             'train_id': ['RAJ001', 'EXP002', 'PASS003', 'FRT004'],
             'train_name': ['Rajdhani Express', 'Shatabdi Express', 'Passenger', 'Goods Train'],
             'train_type': ['Rajdhani', 'Express', 'Passenger', 'Freight'],
@@ -92,7 +93,7 @@ class TestOptimizationAlgorithms(unittest.TestCase):
             'destination_station': ['MUM', 'AGR', 'DEL', 'MUM']
         })
         
-        self.sections_df = pd.DataFrame({
+        cls.sections_df = pd.DataFrame({
             'section_id': ['S001', 'S002', 'S003', 'S004'],
             'from_station': ['DEL', 'GZB', 'AGR', 'BPL'],
             'to_station': ['GZB', 'AGR', 'BPL', 'MUM'],
@@ -101,7 +102,7 @@ class TestOptimizationAlgorithms(unittest.TestCase):
             'track_type': ['Double', 'Single', 'Double', 'Double']
         })
         
-        self.train_sections_df = pd.DataFrame({
+        cls.train_sections_df = pd.DataFrame({
             'train_id': ['RAJ001', 'RAJ001', 'EXP002', 'PASS003', 'FRT004'],
             'section_id': ['S001', 'S002', 'S001', 'S001', 'S003'],
             'scheduled_entry_time': ['08:00', '08:45', '09:30', '11:00', '14:00'],
@@ -250,11 +251,12 @@ if __name__ == '__main__':
 
 class TestExtendedAlgorithms(unittest.TestCase):
 
-    def setUp(self):
-        # Initialize data samples
-        self.trains = pd.DataFrame({'train_id': ['T1', 'T2', 'T3'], 'priority': [1, 2, 2]})
-        self.sections = pd.DataFrame({'section_id': ['S1']})
-        self.train_sections = pd.DataFrame({
+    @classmethod
+    def setUpClass(cls):
+        # Initialize data samples once per class
+        cls.trains = pd.DataFrame({'train_id': ['T1', 'T2', 'T3'], 'priority': [1, 2, 2]})
+        cls.sections = pd.DataFrame({'section_id': ['S1']})
+        cls.train_sections = pd.DataFrame({
             'train_id': ['T1', 'T2', 'T3'],
             'section_id': ['S1', 'S1', 'S1'],
             'scheduled_entry_time': ['08:00', '08:10', '08:20']
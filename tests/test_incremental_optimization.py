@@ -0,0 +1,74 @@
+"""
+Tests for optimizer entry points that reuse a previous result (warm starts, delta re-optimization)
+"""
+import os
+import sys
+import unittest
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.comprehensive_hybrid_optimizer import ComprehensiveHybridOptimizer
+from algorithms.milp_optimizer import MILPOptimizer
+
+
+class TestIncrementalOptimization(unittest.TestCase):
+
+    def test_milp_optimizer_warm_start(self):
+        trains = pd.DataFrame({'train_id': ['T1', 'T2', 'T3'], 'priority': [1, 2, 2]})
+        sections = pd.DataFrame({'section_id': ['S1']})
+        train_sections = pd.DataFrame({
+            'train_id': ['T1', 'T2', 'T3'],
+            'section_id': ['S1', 'S1', 'S1'],
+            'scheduled_entry_time': ['08:00', '08:10', '08:20']
+        })
+
+        milp = MILPOptimizer()
+        cold = milp.optimize(trains, sections, train_sections)
+        warm = milp.optimize(trains, sections, train_sections, warm_start=cold)
+        self.assertIsNotNone(warm)
+
+        # Seeding the solver with its own optimum must lead back to the same total delay
+        scheduled = {(row.train_id, row.section_id): int(row.scheduled_entry_time[:2]) * 60
+                     + int(row.scheduled_entry_time[3:])
+                     for row in train_sections.itertuples()}
+        def total_delay(schedule):
+            return sum(max(0, visit['start_time'] - scheduled[(train_id, visit['section_id'])])
+                       for train_id, visits in schedule.items() for visit in visits)
+        self.assertAlmostEqual(total_delay(warm), total_delay(cold), places=4)
+
+    def test_comprehensive_hybrid_reoptimize(self):
+        trains = pd.DataFrame({'train_id': ['T1', 'T2', 'T3', 'T4'], 'priority': [1, 2, 1, 3]})
+        sections = pd.DataFrame({'section_id': ['S1', 'S2']})
+        train_sections = pd.DataFrame({
+            'train_id': ['T1', 'T1', 'T2', 'T2', 'T3', 'T3', 'T4', 'T4'],
+            'section_id': ['S1', 'S2'] * 4,
+            'start_time': [0, 10, 20, 30, 40, 50, 60, 70],
+            'end_time': [5, 15, 25, 35, 45, 55, 65, 75]
+        })
+        previous_schedule = {train_id: [] for train_id in ['T1', 'T2', 'T3', 'T4']}
+
+        comprehensive = ComprehensiveHybridOptimizer()
+        result = comprehensive.reoptimize(trains, sections, train_sections, previous_schedule, ['T3'])
+        self.assertTrue(result.success)
+        self.assertEqual(sorted(result.schedule), ['T1', 'T2', 'T3', 'T4'])
+
+        # Unaffected trains keep their order from the previous schedule
+        self.assertEqual([t for t in result.schedule if t != 'T3'], ['T1', 'T2', 'T4'])
+
+        # The affected train is placed once, with all of its sections
+        self.assertEqual([s['section_id'] for s in result.schedule['T3']], ['S1', 'S2'])
+
+        # No two trains occupy a section at the same time
+        for section_id in ['S1', 'S2']:
+            slots = sorted((s['entry_time'] + s['delay_added'], s['exit_time'] + s['delay_added'])
+                           for visits in result.schedule.values() for s in visits
+                           if s['section_id'] == section_id)
+            for (_, end), (start, _) in zip(slots, slots[1:]):
+                self.assertLessEqual(end, start)
+
+
+if __name__ == '__main__':
+    unittest.main()
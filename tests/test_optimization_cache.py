@@ -0,0 +1,94 @@
+"""
+Tests for the solver result cache of the optimization routes
+"""
+import asyncio
+import os
+import sys
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.app.routes import optimization
+
+
+class CountingSolve:
+    """Stand-in solver that records its calls; fails the first `failures` of them"""
+
+    def __init__(self, failures=0, release=None):
+        self.calls = 0
+        self.failures = failures
+        self.release = release
+
+    def __call__(self, trains_df, sections_df, train_sections_df):
+        self.calls += 1
+        if self.release is not None:
+            self.release.wait(timeout=5)
+        if self.calls <= self.failures:
+            raise RuntimeError("solver failed")
+        return {"trains": trains_df['train_id'].tolist()}
+
+
+class TestCachedSolve(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        optimization._result_cache.clear()
+        optimization._in_flight.clear()
+        # Threads instead of the app's worker processes, so the stand-in solver needn't be pickled
+        executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        patcher = mock.patch.object(optimization, "get_pool", return_value=executor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.frames = (
+            pd.DataFrame({'train_id': ['T1', 'T2'], 'priority': [1, 2]}),
+            pd.DataFrame({'section_id': ['S1']}),
+            pd.DataFrame({'train_id': ['T1', 'T2'], 'section_id': ['S1', 'S1']}),
+        )
+
+    async def test_identical_inputs_hit_cache(self):
+        solve = CountingSolve()
+        first = await optimization._cached_solve("milp", self.frames, solve)
+        second = await optimization._cached_solve("milp", self.frames, solve)
+        self.assertEqual(solve.calls, 1)
+        self.assertEqual(first, second)
+
+    async def test_changed_inputs_miss_cache(self):
+        solve = CountingSolve()
+        await optimization._cached_solve("milp", self.frames, solve)
+
+        trains_df = self.frames[0].copy()
+        trains_df.loc[0, 'priority'] = 3
+        await optimization._cached_solve("milp", (trains_df,) + self.frames[1:], solve)
+        # The method name is part of the key too
+        await optimization._cached_solve("rl", self.frames, solve)
+        self.assertEqual(solve.calls, 3)
+
+    async def test_exception_not_cached(self):
+        solve = CountingSolve(failures=1)
+        with self.assertRaises(RuntimeError):
+            await optimization._cached_solve("milp", self.frames, solve)
+        result = await optimization._cached_solve("milp", self.frames, solve)
+        self.assertEqual(solve.calls, 2)
+        self.assertEqual(result, {"trains": ['T1', 'T2']})
+
+    async def test_concurrent_requests_share_one_solve(self):
+        release = threading.Event()
+        solve = CountingSolve(release=release)
+        waiting = [asyncio.create_task(optimization._cached_solve("milp", self.frames, solve))
+                   for _ in range(3)]
+        await asyncio.sleep(0.1)
+        release.set()
+        results = await asyncio.gather(*waiting)
+        self.assertEqual(solve.calls, 1)
+        self.assertTrue(all(result == results[0] for result in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
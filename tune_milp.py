@@ -0,0 +1,59 @@
+"""
+MILP Solver Tuning Script
+Times candidate solver settings on slices of the bundled data and saves the fastest
+for MILPOptimizer to pick up on every later run
+"""
+
+import json
+import time
+import pandas as pd
+from algorithms.milp_optimizer import MILPOptimizer, TUNED_OPTIONS_PATH
+
+# Settings that change how the solver searches, never what counts as optimal
+CANDIDATE_OPTIONS = {
+    'PULP_CBC_CMD': [{}, {'cuts': False}, {'presolve': False}, {'strong': 0}, {'cuts': False, 'strong': 0}],
+    'HiGHS': [{}, {'threads': 1}],
+    'HiGHS_CMD': [{}, {'threads': 1}],
+}
+
+def time_options(solver_name, options, instances):
+    """Total solve time over every instance, or None if any instance fails to solve"""
+    optimizer = MILPOptimizer(solver_options={solver_name: options})
+    start = time.perf_counter()
+    for trains, sections, train_sections in instances:
+        if optimizer.optimize(trains, sections, train_sections) is None:
+            return None
+    return time.perf_counter() - start
+
+def main():
+    print("🔧 MILP Solver Tuning")
+    print("=" * 50)
+    
+    trains = pd.read_csv("data/trains.csv")
+    sections = pd.read_csv("data/sections.csv")
+    train_sections = pd.read_csv("data/train_sections.csv")
+    
+    # MILPOptimizer solves 10 trains at a time, so tune on several consecutive slices of 10
+    instances = []
+    for offset in range(0, min(len(trains), 50), 10):
+        subset = trains.iloc[offset:offset + 10]
+        subset_sections = train_sections[train_sections['train_id'].isin(subset['train_id'])]
+        instances.append((subset, sections[sections['section_id'].isin(subset_sections['section_id'])],
+                          subset_sections))
+    
+    solver_name = MILPOptimizer(solver_options={})._make_solver().name
+    print(f"Solver: {solver_name} ({len(instances)} instances)")
+    
+    best_options, best_time = {}, float('inf')
+    for options in CANDIDATE_OPTIONS.get(solver_name, [{}]):
+        elapsed = time_options(solver_name, options, instances)
+        print(f"   {json.dumps(options):40s} {'failed' if elapsed is None else f'{elapsed:.2f}s'}")
+        if elapsed is not None and elapsed < best_time:
+            best_options, best_time = options, elapsed
+    
+    with open(TUNED_OPTIONS_PATH, 'w') as f:
+        json.dump({solver_name: best_options}, f, indent=2)
+    print(f"✅ Saved {json.dumps(best_options)} to {TUNED_OPTIONS_PATH}")
+
+if __name__ == "__main__":
+    main()
@@ -25,19 +25,17 @@ print("Train_Sections OK?", set(train_sections.columns) >= expected_train_sectio
 # -------------------
 # 2. Time format check (HH:MM)
 # -------------------
-def is_hhmm(time_str):
-    try:
-        pd.to_datetime(time_str, format="%H:%M")
-        return True
-    except:
-        return False
+def bad_hhmm(col):
+    # One vectorized parse per column; anything that is not HH:MM comes back as NaT
+    parsed = pd.to_datetime(col.astype(str), format="%H:%M", errors="coerce")
+    return col[parsed.isna()].tolist()
 
 bad_times = []
 for col in ["scheduled_start_time"]:
-    bad_times.extend([t for t in trains[col] if not is_hhmm(str(t))])
+    bad_times.extend(bad_hhmm(trains[col]))
 
-bad_times.extend([t for t in train_sections["scheduled_entry_time"] if not is_hhmm(str(t))])
-bad_times.extend([t for t in train_sections["scheduled_exit_time"] if not is_hhmm(str(t))])
+bad_times.extend(bad_hhmm(train_sections["scheduled_entry_time"]))
+bad_times.extend(bad_hhmm(train_sections["scheduled_exit_time"]))
 
 print("\nTime format check:")
 if bad_times:
@@ -48,8 +46,8 @@ else:
 # -------------------
 # 3. Foreign key checks
 # -------------------
-missing_trains = [tid for tid in train_sections["train_id"].unique() if tid not in trains["train_id"].unique()]
-missing_sections = [sid for sid in train_sections["section_id"].unique() if sid not in sections["section_id"].unique()]
+missing_trains = train_sections.loc[~train_sections["train_id"].isin(trains["train_id"]), "train_id"].unique().tolist()
+missing_sections = train_sections.loc[~train_sections["section_id"].isin(sections["section_id"]), "section_id"].unique().tolist()
 
 print("\nForeign key check:")
 if not missing_trains and not missing_sections: